@@ -0,0 +1,82 @@
+"""Benchmark of the feed parsers on a synthetic project feed.
+
+Every available parser reads the same feed, and the best time
+of several runs is reported. Run with the package installed
+(i.e. ``pip install -e .``)::
+
+    python benchmarks/feed_parsers.py [NUMBER_OF_ADDONS]
+"""
+
+import io
+import json
+import sys
+import timeit
+from typing import Mapping
+
+from mccurse import curse
+
+#: Number of runs of each parser
+REPEAT = 3
+
+
+def synthetic_addon(id: int) -> Mapping:
+    """Construct add-on data, resembling the real feed ones."""
+
+    path = 'mods' if id % 3 == 0 else 'texture-packs'
+    files = [
+        {
+            'Id': id * 10 + n,
+            'FileName': 'addon-{}-{}.jar'.format(id, n),
+            'GameVersion': ['1.10.2', '1.11'],
+            'Dependencies': [{'AddonId': n, 'Type': 'Required'}] * 3,
+            'Modules': [{'Foldername': 'META-INF', 'Fingerprint': 42}] * 4,
+        }
+        for n in range(5)
+    ]
+
+    return {
+        'Id': id,
+        'Name': 'Add-on #{}'.format(id),
+        'Summary': 'Synthetic add-on number {} for benchmarking'.format(id),
+        'CategorySection': {'Name': path.capitalize(), 'Path': path},
+        'LatestFiles': files,
+    }
+
+
+def synthetic_feed(size: int) -> bytes:
+    """Construct encoded feed with size add-ons."""
+
+    return json.dumps({
+        'timestamp': 1500000000000,
+        'data': [synthetic_addon(i) for i in range(size)],
+    }).encode('utf-8')
+
+
+def available_parsers():
+    """Provide names of parsers available on this system."""
+
+    for name in curse.STREAMING_PARSERS:
+        try:
+            curse.streaming_parser(name)
+        except ImportError:
+            continue
+        yield name
+
+    yield curse.DOCUMENT_PARSER
+
+
+def main(size: int = 10000) -> None:
+    feed = synthetic_feed(size)
+    print('Feed: {} add-ons, {:.1f} MiB'.format(size, len(feed) / 2**20))
+
+    for parser in available_parsers():
+        def read():
+            contents = curse.FeedContents(io.BytesIO(feed), parser=parser)
+            return sum(1 for _ in contents.mods())
+
+        best = min(timeit.repeat(read, number=1, repeat=REPEAT))
+        print('{:>12}: {:7.3f} s ({:.0f} add-ons/s)'.format(parser, best, size / best))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,134 @@
+"""Benchmark of the mod lookups in the database and in the catalogue.
+
+A database with synthetic mods is created in a temporary directory
+and its catalogue exported. Each database lookup is timed with a fresh
+session and empty lookup cache, each catalogue lookup with a freshly
+opened catalogue, as in a new command invocation. The start-up cost
+of the imports is reported for comparison, along with the complete shell
+completion of a mod name, as run by the shell. Run with the package
+installed (i.e. ``pip install -e .``)::
+
+    python benchmarks/mod_lookups.py [NUMBER_OF_MODS]
+"""
+
+import os
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import click
+
+from mccurse import RESOURCE_NAME, addon, catalogue, cli, curse, schema
+
+#: Number of runs of each lookup
+REPEAT = 5
+
+
+def synthetic_mod(id: int) -> dict:
+    """Construct mod data, resembling the feed ones."""
+
+    return {
+        'Id': id,
+        'Name': 'Synthetic Mod #{}'.format(id),
+        'Summary': 'Synthetic mod number {} for benchmarking'.format(id),
+        'DownloadCount': id * 10,
+        'PopularityScore': id / 3,
+    }
+
+
+def import_time(module: str) -> float:
+    """Measure the time of importing a module in a new interpreter."""
+
+    def run(statement):
+        return subprocess.run([sys.executable, '-c', statement], check=True)
+
+    bare = min(timeit.repeat(lambda: run('pass'), number=1, repeat=REPEAT))
+    full = min(timeit.repeat(lambda: run('import ' + module), number=1, repeat=REPEAT))
+    return full - bare
+
+
+def completion_time(cache_home: Path, words: str) -> float:
+    """Measure the shell completion of the last of the words in a new interpreter."""
+
+    # Click 8 changed the completion protocol
+    request = 'complete' if click.__version__.startswith('7.') else 'bash_complete'
+    environment = dict(
+        os.environ,
+        XDG_CACHE_HOME=str(cache_home),
+        COMP_WORDS=words,
+        COMP_CWORD=str(len(words.split()) - 1),
+        _MCCURSE_COMPLETE=request,
+    )
+
+    def run():
+        command = [sys.executable, '-m', RESOURCE_NAME]
+        completed = subprocess.run(command, env=environment, stdout=subprocess.PIPE, check=True)
+        assert completed.stdout, 'Nothing completed'
+
+    return min(timeit.repeat(run, number=1, repeat=REPEAT))
+
+
+def main(size: int = 60000) -> None:
+    with TemporaryDirectory() as root:
+        # Database of the default game in the cache, to be found by the completion
+        cache_dir = Path(root) / RESOURCE_NAME
+        cache_dir.mkdir()
+        database = curse.Database(cli.DEFAULT_GAME.lower(), cache_dir)
+        schema.upgrade(database.engine)
+        rows = (addon.Mod.row_from_json(synthetic_mod(i)) for i in range(size))
+        database.bulk_load(addon.Mod.__table__, rows, replace=True)
+        addon.Mod.ensure_search_index(database.engine)
+        database.version = datetime.now(tz=timezone.utc)
+        database.export_catalogue()
+        print('Database: {} mods'.format(size))
+
+        middle = size // 2
+        name = 'synthetic mod #{}'.format(middle)
+        lookups = [
+            ('with_id', lambda s: addon.Mod.with_id(s, middle)),
+            ('find', lambda s: addon.Mod.find(s, name)),
+            ('complete', lambda s: addon.Mod.complete(s, 'synthetic mod #1', limit=20)),
+            ('search', lambda s: addon.Mod.search(s, 'number {}'.format(middle))),
+        ]
+
+        for title, lookup in lookups:
+            def run():
+                addon.lookup_cache.clear()
+                session = curse.SQLSession(bind=database.engine)
+                try:
+                    lookup(session)
+                finally:
+                    session.close()
+
+            best = min(timeit.repeat(run, number=1, repeat=REPEAT))
+            print('{:>12}: {:7.3f} ms (database)'.format(title, best * 1000))
+
+        entries = [
+            ('with_id', lambda c: c.with_id(middle)),
+            ('find', lambda c: c.find(name)),
+            ('complete', lambda c: c.complete('synthetic mod #1', limit=20)),
+            ('search', lambda c: c.search('number {}'.format(middle))),
+        ]
+
+        for title, lookup in entries:
+            def run():
+                with catalogue.open_current(database.path) as opened:
+                    lookup(opened)
+
+            best = min(timeit.repeat(run, number=1, repeat=REPEAT))
+            print('{:>12}: {:7.3f} ms (catalogue)'.format(title, best * 1000))
+
+        best = completion_time(Path(root), 'mccurse install Synthetic')
+        print('{:>12}: {:7.3f} ms (shell completion)'.format('complete', best * 1000))
+
+    for module in ('sqlalchemy', 'mccurse.catalogue', 'mccurse.addon', 'mccurse.cli'):
+        print('{:>12}: {:7.3f} ms (import {})'.format(
+            'start-up', import_time(module) * 1000, module,
+        ))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
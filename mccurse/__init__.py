@@ -15,6 +15,14 @@ PKGDIR = Path(__file__).resolve().parent
 #: Package data directory
 PKGDATA = PKGDIR / '_data_'
 
+#: File name format of the game databases
+DATABASE_BASENAME = '{game_name}-addons.sqlite'
+
+#: Names of the streaming feed parsers (ijson backends), from the fastest
+STREAMING_PARSERS = ('yajl2_c', 'yajl2_cffi', 'yajl2', 'python')
+#: Name of the non-streaming parser -- faster for small feeds
+DOCUMENT_PARSER = 'json'
+
 #: Root of the locale files
 localedir = PKGDATA / 'locales'
 
@@ -1,5 +1,6 @@
 """Package interface for direct calls."""
 
-from . import cli
+from . import RESOURCE_NAME, cli
 
-cli.cli()
+# Named as the installed script, so the shell completion works the same
+cli.cli(prog_name=RESOURCE_NAME)
@@ -2,29 +2,41 @@
    (i.e. Mod, mod's File, etc.).
 """
 
+import hashlib
+import re
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum, unique
 from functools import total_ordering
-from typing import Any, Mapping, Sequence, Type
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+from typing import Sequence, Set, Tuple, Type, TypeVar
 
 import attr
 from attr import validators as vld
 from iso8601 import parse_date
-from sqlalchemy import Column, Integer, String
-from sqlalchemy import or_, bindparam
+from sqlalchemy import Column, Float, Index, Integer, String, Table
+from sqlalchemy import or_, bindparam, column, distinct, event, func, select, table, text
+from sqlalchemy.engine import Connectable
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.baked import bakery
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred, validates
 from sqlalchemy.orm.session import Session as SQLSession
 
 # Used exceptions -- make them available in current namespace
 from sqlalchemy.orm.exc import NoResultFound, MultipleResultsFound  # noqa: F401
 
 from .util import yaml
+from .util.cache import LRUCache
 
 # Declarative base class for DB table definitions
 AddonBase = declarative_base()
 # Cache for pre-compiling SQL queries
 SQLBakery = bakery()
+# Cache of the results of repeated searches (ids of the found mods)
+lookup_cache = LRUCache()
+
+T = TypeVar('T')
 
 
 class Mod(AddonBase):
@@ -36,12 +48,42 @@ class Mod(AddonBase):
 
     __tablename__ = 'mods'
 
+    #: Columns which are stored to and loaded from the project feed
+    _FEED_COLUMNS = 'id', 'name', 'summary'
+    #: Columns (and categories) whose contents are covered by the digest
+    _DIGEST_COLUMNS = 'name', 'summary', 'categories'
+    #: Columns changing with (almost) every feed, kept out of the digest
+    COUNTER_COLUMNS = 'downloads', 'popularity'
+    #: Orderings of the search results, besides the relevance
+    _SEARCH_ORDERS = 'popularity', 'downloads', 'name'
+    #: Number of search results loaded at once when iterating over them
+    _SEARCH_BATCH = 100
+    #: Number of candidates for name suggestions, taken from the trigram index
+    _SUGGEST_CANDIDATES = 50
+    #: Minimal similarity of suggested names
+    _SUGGEST_THRESHOLD = 0.3
+
     #: Internal Curse mod identification
     id = Column(Integer, primary_key=True, autoincrement=False)
     #: Official mod name
     name = Column(String, index=True)
     #: Short mod description
     summary = Column(String, index=True)
+    #: Digest of the contents, for change detection; not needed otherwise
+    digest = deferred(Column(Integer))
+    #: Case-folded name, for case-insensitive lookups by the index
+    name_key = deferred(Column(String, index=True))
+    #: Number of downloads, for ordering the search results
+    downloads = deferred(Column(Integer, index=True))
+    #: Popularity score computed by Curse, for ordering the search results
+    popularity = deferred(Column(Float, index=True))
+
+    @validates('name')
+    def _update_name_key(self, key: str, name: str) -> str:
+        """Keep the case-folded name up to date."""
+
+        self.name_key = fold_name(name)
+        return name
 
     def __repr__(self) -> str:
         fmt = 'Mod(id={0.id!r}, name={0.name!r}, summary={0.summary!r})'
@@ -60,6 +102,57 @@ class Mod(AddonBase):
 
     # Adapter methods
 
+    @classmethod
+    def content_digest(cls, row: Mapping) -> int:
+        """Compute compact digest of the row contents.
+
+        Keyword arguments:
+            row: Mapping of column names to their values.
+
+        Returns:
+            The digest, as a signed 64-bit integer.
+        """
+
+        content = '\x1f'.join(repr(row.get(c)) for c in cls._DIGEST_COLUMNS)
+        raw = hashlib.sha1(content.encode('utf-8')).digest()[:8]
+
+        return int.from_bytes(raw, byteorder='big', signed=True)
+
+    @classmethod
+    def row_from_json(cls, jobj: Mapping) -> Dict[str, Any]:
+        """Extract table row values from JSON.
+
+        Keyword arguments:
+            jobj: The JSON data to use.
+
+        Returns:
+            Mapping of column names to their values, including the digest.
+        """
+
+        row = {k: jobj[k.capitalize()] for k in cls._FEED_COLUMNS}
+        row['downloads'] = int(jobj.get('DownloadCount') or 0)
+        row['popularity'] = float(jobj.get('PopularityScore') or 0)
+
+        categories = cls.categories_from_json(jobj)
+        row['digest'] = cls.content_digest(dict(row, categories=categories))
+        row['name_key'] = fold_name(row['name'])
+
+        return row
+
+    @classmethod
+    def categories_from_json(cls, jobj: Mapping) -> Tuple[Tuple[int, str], ...]:
+        """Extract categories of the mod from JSON.
+
+        Keyword arguments:
+            jobj: The JSON data to use.
+
+        Returns:
+            Pairs of id and name of each category, ordered by the ids.
+        """
+
+        categories = jobj.get('Categories') or ()
+        return tuple(sorted({(int(c['CategoryId']), c['Name']) for c in categories}))
+
     @classmethod
     def from_json(cls, jobj: Mapping) -> 'Mod':
         """Construct new instance from JSON.
@@ -71,38 +164,330 @@ class Mod(AddonBase):
             New instance.
         """
 
-        fields = 'id', 'name', 'summary'
+        return cls(**cls.row_from_json(jobj))
+
+    # Full-text search indexes
+
+    @classmethod
+    def ensure_search_index(cls, connection: Connectable) -> bool:
+        """Create the full-text search indexes, if they do not exist yet.
+
+        The indexes are external content FTS5 tables -- one of the words
+        in the mods' names and summaries (used by :meth:`search`), and one
+        of the trigrams in the names (used by :meth:`suggest`). They are
+        kept in sync with the mods by triggers, and filled with the already
+        stored mods when created.
+
+        Keyword arguments:
+            connection: The database connection to use.
+
+        Returns:
+            True if all the indexes are available, False if the SQLite
+            library does not support some of them.
+        """
+
+        available = True
+
+        for index, statements in _SEARCH_INDEXES.items():
+            if cls.has_search_index(connection, index):
+                continue
+
+            try:
+                for statement in statements:
+                    connection.execute(text(statement))
+            except OperationalError:  # FTS5 or its tokenizer not compiled in
+                available = False
+
+        return available
+
+    @classmethod
+    def drop_search_index(cls, connection: Connectable) -> None:
+        """Drop the full-text search indexes, if they exist.
+
+        Keyword arguments:
+            connection: The database connection to use.
+        """
+
+        for index in _SEARCH_INDEXES:
+            for name in ('insert', 'delete', 'update'):
+                connection.execute(text('DROP TRIGGER IF EXISTS {}_{}'.format(index, name)))
+            connection.execute(text('DROP TABLE IF EXISTS {}_vocab'.format(index)))
+            connection.execute(text('DROP TABLE IF EXISTS {}'.format(index)))
 
-        data = {k: jobj[k.capitalize()] for k in fields}
-        return cls(**data)
+    @classmethod
+    def has_search_index(cls, connection: Connectable, index: str = 'mods_fts') -> bool:
+        """Check if a full-text search index exists.
+
+        Keyword arguments:
+            connection: The database connection to use.
+            index: Name of the index to check.
+        """
+
+        query = text("SELECT count(*) FROM sqlite_master WHERE name = :name")
+        return bool(connection.execute(query, {'name': index}).scalar())
 
     # Prepared queries
 
     @classmethod
-    def search(cls, connection: SQLSession, term: str) -> Sequence['Mod']:
-        """Search for Mods that contain TERM in name or summary.
+    def search(
+        cls,
+        connection: SQLSession,
+        term: str,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: str = 'relevance',
+        category: Optional[int] = None
+    ) -> Sequence['Mod']:
+        """Search for Mods that match TERM in name or summary.
+
+        The words of the term are matched as prefixes of the words
+        in the name or summary; all of them must match. The results
+        are ordered by relevance, matches in names being more relevant.
+
+        If the full-text index is not available, the term is searched
+        for as a substring, and the results are ordered by name.
 
         Keyword arguments:
             connection: Database connection to ask on.
             term: The term to search for.
+            limit: Maximal number of results; all of them if None.
+            offset: Number of leading results to skip.
+            sort: Order of the results -- 'relevance', or one of
+                'popularity', 'downloads' (both descending) and 'name'.
+            category: Id of the category the results must belong to;
+                any category if None.
 
         Returns:
             Sequence of matching mods (possibly empty).
+
+        Raises:
+            ValueError: Unknown sort order.
         """
 
+        words = re.findall(r'\w+', term)
+        indexed = bool(words) and cls.has_search_index(connection)
+
+        found = {}  # type: Dict[int, Mod]
+
+        def lookup() -> List[int]:
+            query = cls._search_query(
+                connection, term, limit, offset,
+                indexed=indexed, sort=sort, category=category,
+            )
+            mods = query.all()
+            found.update((mod.id, mod) for mod in mods)
+            return [mod.id for mod in mods]
+
+        # The index matches the words regardless of their case
+        normalized = ' '.join(words).casefold() if indexed else term
+        key = ('search', indexed, normalized, limit, offset, sort, category)
+        ids = cls._cached(connection, key, lookup)
+
+        if not found and ids:
+            found = cls.with_ids(connection, ids)
+        return [found[i] for i in ids if i in found]
+
+    @classmethod
+    def iter_search(
+        cls,
+        connection: SQLSession,
+        term: str,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: str = 'relevance',
+        category: Optional[int] = None
+    ) -> Iterator['Mod']:
+        """Search for Mods as :meth:`search` does, loading them gradually.
+
+        The results are fetched from the database by batches, as they are
+        consumed, so the first ones are available immediately and
+        the memory use does not depend on the number of results.
+        The first batch is looked up by :meth:`search`, so it is cached;
+        the session should not be used for other queries until
+        the iteration is done.
+
+        Keyword arguments:
+            connection: Database connection to ask on.
+            term: The term to search for.
+            limit: Maximal number of results; all of them if None.
+            offset: Number of leading results to skip.
+            sort: Order of the results, see :meth:`search`.
+            category: Id of the category the results must belong to;
+                any category if None.
+
+        Yields:
+            The matching mods, in order.
+
+        Raises:
+            ValueError: Unknown sort order.
+        """
+
+        first = cls._SEARCH_BATCH if limit is None else min(limit, cls._SEARCH_BATCH)
+        page = cls.search(
+            connection, term,
+            limit=first, offset=offset, sort=sort, category=category,
+        )
+        yield from page
+
+        if len(page) < first or limit == first:  # No more results requested or found
+            return
+
+        indexed = bool(re.search(r'\w', term)) and cls.has_search_index(connection)
+        rest = None if limit is None else limit - first
+        query = cls._search_query(
+            connection, term, rest, offset + first,
+            indexed=indexed, sort=sort, category=category, streamed=True,
+        )
+        yield from query
+
+    @classmethod
+    def _search_query(
+        cls,
+        connection: SQLSession,
+        term: str,
+        limit: Optional[int],
+        offset: int,
+        *,
+        indexed: bool,
+        sort: str = 'relevance',
+        category: Optional[int] = None,
+        streamed: bool = False
+    ):
+        """Prepare search query for TERM, with the range of the results.
+
+        If indexed, the full-text index is used; the term must contain
+        some words then. Empty term without the index matches all mods.
+
+        Raises:
+            ValueError: Unknown sort order.
+        """
+
+        if sort != 'relevance' and sort not in cls._SEARCH_ORDERS:
+            raise ValueError('Unknown sort order: {!r}'.format(sort))
+
+        words = re.findall(r'\w+', term)
         query = SQLBakery(lambda conn: conn.query(cls))
-        query += lambda q: q.filter(or_(
-            cls.name.like(bindparam('term')),
-            cls.summary.like(bindparam('term')),
-        ))
-        query += lambda q: q.order_by(cls.name)
+        if indexed:
+            query += lambda q: q.join(_SEARCH_INDEX, _SEARCH_INDEX.c.rowid == cls.id)
+            query += lambda q: q.filter(text('{} MATCH :match'.format(_SEARCH_INDEX.name)))
+            params = {'match': ' '.join('"{}"*'.format(w) for w in words)}
+        else:
+            query += lambda q: q.filter(or_(
+                cls.name.like(bindparam('term')),
+                cls.summary.like(bindparam('term')),
+            ))
+            params = {'term': '%{}%'.format(term)}
+
+        if category is not None:
+            query += lambda q: q.filter(cls.id.in_(
+                select([mod_category_table.c.mod_id])
+                .where(mod_category_table.c.category_id == bindparam('category'))
+            ))
+            params['category'] = category
+
+        # Each ordering is a separate step, so each has its own cached SQL
+        if sort == 'popularity':
+            query += lambda q: q.order_by(cls.popularity.desc(), cls.name)
+        elif sort == 'downloads':
+            query += lambda q: q.order_by(cls.downloads.desc(), cls.name)
+        elif sort == 'relevance' and indexed:
+            query += lambda q: q.order_by(text(_SEARCH_RANK), cls.name)
+        else:
+            query += lambda q: q.order_by(cls.name)
+
+        query += lambda q: q.limit(bindparam('limit')).offset(bindparam('offset'))
+        if streamed:
+            query += lambda q: q.yield_per(cls._SEARCH_BATCH)
+
+        # Negative limit means no limit in SQLite
+        params.update(limit=-1 if limit is None else limit, offset=offset)
+        return query(connection).params(**params)
+
+    @classmethod
+    def store_categories(
+        cls,
+        connection: Connectable,
+        categories: Mapping[int, Sequence[Tuple[int, str]]],
+        *,
+        complete: bool = True
+    ) -> Tuple[int, int]:
+        """Store the categories of the mods, writing only the changes.
+
+        Keyword arguments:
+            connection: The database connection to use.
+            categories: Mapping of mod ids to their categories,
+                as pairs of category id and name.
+            complete: The mapping covers all the mods -- categories of mods
+                missing from it are deleted, as are the unused categories.
+
+        Returns:
+            Numbers of the added and removed memberships.
+        """
+
+        links = mod_category_table
+        names = {cid: name for pairs in categories.values() for cid, name in pairs}
+        current = {(mod, cid) for mod, pairs in categories.items() for cid, _name in pairs}
+
+        with connection.connect() as conn, conn.begin():
+            if names:
+                conn.execute(category_table.insert().prefix_with('OR REPLACE'), [
+                    {'id': cid, 'name': name} for cid, name in names.items()
+                ])
+
+            query = select([links.c.mod_id, links.c.category_id])
+            stored = {tuple(row) for row in conn.execute(query)}
+            if not complete:
+                stored = {link for link in stored if link[0] in categories}
+
+            added, removed = current - stored, stored - current
+            if added:
+                conn.execute(links.insert(), [
+                    {'mod_id': mod, 'category_id': cid} for mod, cid in added
+                ])
+            if removed:
+                conn.execute(links.delete().where(
+                    (links.c.mod_id == bindparam('mod')) & (links.c.category_id == bindparam('cid'))
+                ), [{'mod': mod, 'cid': cid} for mod, cid in removed])
+
+            if complete:
+                used = select([links.c.category_id])
+                conn.execute(category_table.delete().where(~category_table.c.id.in_(used)))
+
+        return len(added), len(removed)
+
+    @classmethod
+    def find_category(cls, connection: SQLSession, name: str) -> int:
+        """Find category named NAME, ignoring the case.
+
+        Keyword arguments:
+            connection: Database connection to ask on.
+            name: The name of the category.
+
+        Returns:
+            The id of the category.
+
+        Raises:
+            NoResultFound: No category has the name.
+        """
 
-        return query(connection).params(term='%{}%'.format(term)).all()
+        query = select([category_table.c.id]).where(
+            func.lower(category_table.c.name) == name.lower()
+        )
+        id = connection.execute(query).scalar()
+        if id is None:
+            raise NoResultFound('No category named {!r}'.format(name))
+        return id
 
     @classmethod
     def find(cls, connection: SQLSession, name: str) -> 'Mod':
         """Find exactly one Mod named NAME.
 
+        The name is matched ignoring its case, by the index of the
+        case-folded names. Names containing the SQL wildcards
+        (``%`` and ``_``) are patterns, matched by ``LIKE``.
+
         Keyword Arguments:
             connection: Database connection to ask on.
             name: The name of the mod to search for.
@@ -117,9 +502,202 @@ class Mod(AddonBase):
         """
 
         query = SQLBakery(lambda conn: conn.query(cls))
-        query += lambda q: q.filter(cls.name.like(bindparam('name')))
+        if _WILDCARDS.search(name):
+            query += lambda q: q.filter(cls.name.like(bindparam('name')))
+            params = {'name': name}
+        else:
+            query += lambda q: q.filter(cls.name_key == bindparam('key'))
+            params = {'key': fold_name(name)}
 
-        return query(connection).params(name='{}'.format(name)).one()
+        return query(connection).params(**params).one()
+
+    @classmethod
+    def _cached(cls, connection: SQLSession, query: Tuple, lookup: Callable[[], T]) -> T:
+        """Look up the result of a query in the :data:`lookup_cache`.
+
+        The cached results are tied to the database and the version
+        of its data, so they are never used after the data are refreshed.
+        The data are expected not to change otherwise. In-memory
+        databases are never cached.
+
+        Keyword arguments:
+            connection: Database connection the query is asked on.
+            query: The kind of the query and its normalized parameters.
+            lookup: Function asking the query, if the result is not cached.
+
+        Returns:
+            The (possibly cached) result of the lookup.
+        """
+
+        prefix = cls._cache_prefix(connection)
+        if prefix is None:
+            return lookup()
+
+        return lookup_cache.get(prefix + query, lookup)
+
+    @classmethod
+    def _cache_prefix(cls, connection: SQLSession) -> Optional[Tuple]:
+        """Identify the database and the version of its data, for the cache keys.
+
+        Returns:
+            The start of the keys of the cached results, or None
+            if the results of the database are not cached.
+        """
+
+        url = connection.get_bind().url
+        if url.database in {None, '', ':memory:'}:
+            return None
+
+        version = connection.execute(text('PRAGMA user_version')).scalar()
+        return str(url), version
+
+    @classmethod
+    def find_many(cls, connection: SQLSession, names: Iterable[str]) -> Dict[str, 'Mod']:
+        """Find Mods for several names at once, in a single query.
+
+        The names are matched ignoring their case. Names containing
+        the SQL wildcards (``%`` and ``_``) are patterns, matched one by one
+        as by :meth:`find`; the rest are looked up at once, as exact names.
+
+        Keyword Arguments:
+            connection: Database connection to ask on.
+            names: The names of the mods to search for.
+
+        Returns:
+            Mapping of the names to the found mods.
+            Names not matching any mod are missing from it.
+
+        Raises:
+            MultipleResultsFound: Some name is too ambiguous,
+                multiple matching mods found.
+        """
+
+        found = {}  # type: Dict[str, Mod]
+        requested = {}  # type: Dict[str, List[str]]
+        for name in names:
+            if not _WILDCARDS.search(name):
+                requested.setdefault(fold_name(name), []).append(name)
+                continue
+
+            try:
+                found[name] = cls.find(connection, name)
+            except NoResultFound:
+                pass
+
+        if not requested:
+            return found
+
+        query = SQLBakery(lambda conn: conn.query(cls))
+        query += lambda q: q.filter(cls.name_key.in_(bindparam('names', expanding=True)))
+        mods = query(connection).params(names=list(requested))
+
+        for mod in mods:
+            for name in requested.get(fold_name(mod.name), ()):
+                if name in found:
+                    msg = 'Multiple mods named {!r}'.format(name)
+                    raise MultipleResultsFound(msg)
+                found[name] = mod
+
+        return found
+
+    @classmethod
+    def complete(
+        cls,
+        connection: SQLSession,
+        prefix: str,
+        *,
+        limit: Optional[int] = None
+    ) -> Sequence[str]:
+        """Find names of Mods starting with PREFIX, ignoring case.
+
+        The names are looked up as a range of the case-folded names
+        in their index, so the lookup is fast regardless of the number
+        of mods.
+
+        Keyword Arguments:
+            connection: Database connection to ask on.
+            prefix: The start of the names.
+            limit: Maximal number of names; all of them if None.
+
+        Returns:
+            The matching names, in case-insensitive alphabetical order.
+        """
+
+        low = fold_name(prefix)
+        params = {'low': low, 'limit': -1 if limit is None else limit}
+
+        query = SQLBakery(lambda conn: conn.query(cls.name))
+        query += lambda q: q.filter(cls.name_key >= bindparam('low'))
+        # Names with the prefix sort before the prefix with its last character incremented
+        if low:
+            query += lambda q: q.filter(cls.name_key < bindparam('high'))
+            params['high'] = low[:-1] + chr(ord(low[-1]) + 1)
+        query += lambda q: q.order_by(cls.name_key)
+        query += lambda q: q.limit(bindparam('limit'))
+
+        return [name for name, in query(connection).params(**params)]
+
+    @classmethod
+    def suggest(cls, connection: SQLSession, name: str, *, limit: int = 5) -> Sequence['Mod']:
+        """Find Mods with names similar to NAME.
+
+        The names are compared by their trigrams (triples of consecutive
+        characters, ignoring case). The mods sharing the most trigrams with
+        the name are looked up in the trigram index, and then ranked by
+        the similarity of the trigram sets. Without the index, all
+        the mods are compared. The ids of the suggested mods are kept
+        in the :data:`lookup_cache`.
+
+        Keyword Arguments:
+            connection: Database connection to ask on.
+            name: The (possibly misspelled) mod name.
+            limit: Maximal number of the suggestions.
+
+        Returns:
+            The similar mods, most similar first (possibly empty).
+        """
+
+        wanted = _trigrams(name)
+        indexed = bool(wanted) and cls.has_search_index(connection, _TRIGRAM_INDEX.name)
+
+        def lookup() -> List[int]:
+            # Only the names are needed for the ranking
+            if indexed:
+                trigrams = sorted(wanted)
+                candidates = cls._trigram_candidates(connection).params(trigrams=trigrams).all()
+            else:
+                candidates = connection.query(cls.id, cls.name).all()
+
+            scored = ((_similarity(name, wanted, n), n, id) for id, n in candidates)
+            ranked = sorted(
+                (s for s in scored if s[0] >= cls._SUGGEST_THRESHOLD),
+                key=lambda s: (-s[0], s[1]),
+            )
+            return [id for _, _, id in ranked[:limit]]
+
+        ids = cls._cached(connection, ('suggest', indexed, name, limit), lookup)
+
+        found = cls.with_ids(connection, ids)
+        return [found[id] for id in ids if id in found]
+
+    @classmethod
+    def _trigram_candidates(cls, connection: SQLSession):
+        """Prepare query for ids and names of mods sharing most of `trigrams` parameter."""
+
+        # Ranking by bm25 is too slow for the common trigrams;
+        # count the shared ones directly in the index instead
+        shared = select([_TRIGRAM_VOCABULARY.c.doc])
+        shared = shared.where(_TRIGRAM_VOCABULARY.c.term.in_(
+            bindparam('trigrams', expanding=True)
+        ))
+        shared = shared.group_by(_TRIGRAM_VOCABULARY.c.doc)
+        shared = shared.order_by(func.count(distinct(_TRIGRAM_VOCABULARY.c.term)).desc())
+        shared = shared.limit(cls._SUGGEST_CANDIDATES)
+
+        query = SQLBakery(lambda conn: conn.query(cls.id, cls.name))
+        query += lambda q: q.filter(cls.id.in_(shared))
+
+        return query(connection)
 
     @classmethod
     def with_id(cls, connection: SQLSession, id: int) -> 'Mod':
@@ -141,6 +719,162 @@ class Mod(AddonBase):
 
         return query(connection).params(id=id).one()
 
+    @classmethod
+    def with_ids(cls, connection: SQLSession, ids: Iterable[int]) -> Dict[int, 'Mod']:
+        """Fetch several mods from database, in a single query.
+
+        Keyword arguments:
+            connection: Database connection to fetch from.
+            ids: The id fields of the mods to get.
+
+        Returns:
+            Mapping of the ids to the mods.
+            Ids of non-existent mods are missing from it.
+        """
+
+        ids = list(ids)
+        if not ids:
+            return {}
+
+        query = SQLBakery(lambda conn: conn.query(cls))
+        query += lambda q: q.filter(cls.id.in_(bindparam('ids', expanding=True)))
+
+        return {mod.id: mod for mod in query(connection).params(ids=ids)}
+
+
+#: Categories of the mods
+category_table = Table(
+    'categories', AddonBase.metadata,
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('name', String),
+)
+
+#: Membership of the mods in the categories
+mod_category_table = Table(
+    'mod_categories', AddonBase.metadata,
+    Column('category_id', Integer, primary_key=True, autoincrement=False),
+    Column('mod_id', Integer, primary_key=True, autoincrement=False),
+    Index('ix_mod_categories_mod_id', 'mod_id'),
+)
+
+
+#: Full-text search index of mods
+_SEARCH_INDEX = table('mods_fts', column('rowid'), column('name'), column('summary'))
+
+#: Relevance of a search result; name matches weight more than summary ones
+_SEARCH_RANK = 'bm25(mods_fts, 10.0, 1.0)'
+
+#: Trigram index of mod names
+_TRIGRAM_INDEX = table('mods_trigrams', column('rowid'), column('name'))
+
+#: Occurrences of the trigrams in the index
+_TRIGRAM_VOCABULARY = table('mods_trigrams_vocab', column('term'), column('doc'))
+
+
+#: Wildcards of the SQL LIKE patterns
+_WILDCARDS = re.compile('[%_]')
+
+
+def fold_name(name: str) -> str:
+    """Case-fold a mod name, for case-insensitive comparisons."""
+
+    return name.casefold()
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Split text to its (case-insensitive) trigrams."""
+
+    folded = text.casefold()
+    return {folded[i:i+3] for i in range(len(folded) - 2)}
+
+
+def _similarity(name: str, trigrams: Set[str], other: str) -> float:
+    """Compute similarity of two names, from 0 (distinct) to 1 (same).
+
+    Keyword arguments:
+        name: The first name.
+        trigrams: Trigrams of the first name.
+        other: The second name.
+    """
+
+    others = _trigrams(other)
+    if not trigrams or not others:  # Too short names
+        return float(name.casefold() == other.casefold())
+
+    return len(trigrams & others) / len(trigrams | others)
+
+
+def _search_index_ddl(index: str, columns: Sequence[str], options: str) -> Sequence[str]:
+    """Prepare creation of a search index of the mods.
+
+    Keyword arguments:
+        index: Name of the index.
+        columns: The indexed columns of the mods.
+        options: Additional FTS5 options.
+
+    Returns:
+        SQL statements creating the index, the triggers keeping it in sync
+        with the mods, and filling it with the stored ones.
+    """
+
+    fmt = {
+        'index': index,
+        'columns': ', '.join(columns),
+        'old': ', '.join('old.' + c for c in columns),
+        'new': ', '.join('new.' + c for c in columns),
+        'options': options,
+    }
+
+    statements = (
+        """CREATE VIRTUAL TABLE {index} USING fts5(
+            {columns}, content='mods', content_rowid='id', {options}
+        )""",
+        """CREATE TRIGGER {index}_insert AFTER INSERT ON mods BEGIN
+            INSERT INTO {index}(rowid, {columns}) VALUES (new.id, {new});
+        END""",
+        """CREATE TRIGGER {index}_delete AFTER DELETE ON mods BEGIN
+            INSERT INTO {index}({index}, rowid, {columns})
+            VALUES ('delete', old.id, {old});
+        END""",
+        """CREATE TRIGGER {index}_update AFTER UPDATE OF id, {columns} ON mods BEGIN
+            INSERT INTO {index}({index}, rowid, {columns})
+            VALUES ('delete', old.id, {old});
+            INSERT INTO {index}(rowid, {columns}) VALUES (new.id, {new});
+        END""",
+        "INSERT INTO {index}({index}) VALUES ('rebuild')",
+    )
+
+    return tuple(s.format_map(fmt) for s in statements)
+
+
+#: Search indexes of the mods, with their creation statements
+_SEARCH_INDEXES = OrderedDict([
+    (_SEARCH_INDEX.name, _search_index_ddl(
+        _SEARCH_INDEX.name, ('name', 'summary'), "prefix='2 3'",
+    )),
+    (_TRIGRAM_INDEX.name, _search_index_ddl(
+        _TRIGRAM_INDEX.name, ('name',), "tokenize='trigram'",
+    ) + (
+        "CREATE VIRTUAL TABLE {} USING fts5vocab({}, instance)".format(
+            _TRIGRAM_VOCABULARY.name, _TRIGRAM_INDEX.name,
+        ),
+    )),
+])
+
+
+@event.listens_for(Mod.__table__, 'after_create')
+def _create_search_index(target, connection, **kw) -> None:
+    """Create search index along with the mods table."""
+
+    Mod.ensure_search_index(connection)
+
+
+@event.listens_for(Mod.__table__, 'before_drop')
+def _drop_search_index(target, connection, **kw) -> None:
+    """Drop search index along with the mods table."""
+
+    Mod.drop_search_index(connection)
+
 
 @yaml.tag('!release', pattern='^(Alpha|Beta|Release)$')
 @unique
@@ -272,8 +1006,7 @@ class File:
         """
 
         # Dump mod part
-        columns = (str(c).split('.')[-1] for c in Mod.__table__.columns)
-        yml = {f: getattr(instance.mod, f) for f in columns}
+        yml = {f: getattr(instance.mod, f) for f in Mod._FEED_COLUMNS}
 
         # Dump the file part
         yml['file'] = attr.asdict(instance)
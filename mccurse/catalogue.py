@@ -0,0 +1,370 @@
+"""Compact read-only catalogue of the mods.
+
+The catalogue is a single file, exported from the database when the data
+are refreshed, and memory-mapped when read. It consists of:
+
+1. header with the version of the data and the number of the mods;
+2. fixed-size records of the mods, ordered by their ids, each pointing
+   to its name and summary in the string blob;
+3. numbers of the records, ordered by the case-folded names of the mods;
+4. string blob with the UTF-8 encoded names and summaries;
+5. case-folded names and summaries of the mods, one line per mod
+   in the order of the records, for scanning by full-text searches.
+
+Only the standard library is used, so the catalogue can be read without
+the start-up cost of the database machinery, and the lookups do not
+construct anything but the found entries. The catalogue exported from
+a database is found and checked against it by :func:`open_current`::
+
+    with open_current(database_path) as mods:
+        mods.find('JourneyMap')
+"""
+
+import mmap
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from struct import Struct
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+#: Identification of the file format
+MAGIC = b'MCCURSE\x01'
+
+#: File header: magic, version of the data (timestamp), number of the mods,
+#: size of the string blob
+_HEADER = Struct('<8sqII')
+#: Mod record: id, offset and length of the name, and of the summary
+_RECORD = Struct('<qIIII')
+#: Item of the name order: number of the record
+_ORDER = Struct('<I')
+
+#: Separator of the name and the summary in the case-folded text
+_NAME_END = '\x1f'
+#: Characters replaced in the case-folded text, not to break its structure
+_SEPARATORS = re.compile('[\n\x1f]')
+
+#: Single mod in the catalogue
+Entry = NamedTuple('Entry', [('id', int), ('name', str), ('summary', str)])
+
+
+class InvalidCatalogueError(ValueError):
+    """The catalogue file is damaged or of unknown format."""
+
+
+def build(path: Path, mods: Iterable[Tuple[int, str, str]], *, version: datetime) -> int:
+    """Write new catalogue of the mods.
+
+    The file is replaced atomically, so the readers never see it
+    incomplete.
+
+    Keyword arguments:
+        path: The catalogue file to write.
+        mods: The ids, names and summaries of the mods.
+        version: The version of the data.
+
+    Returns:
+        Number of the written mods.
+    """
+
+    mods = sorted((id, name or '', summary or '') for id, name, summary in mods)
+
+    blob = bytearray()
+    records = bytearray()
+    for id, name, summary in mods:
+        name_raw, summary_raw = name.encode('utf-8'), summary.encode('utf-8')
+        records += _RECORD.pack(
+            id,
+            len(blob), len(name_raw),
+            len(blob) + len(name_raw), len(summary_raw),
+        )
+        blob += name_raw + summary_raw
+
+    order = sorted(range(len(mods)), key=lambda i: mods[i][1].casefold())
+    folded = '\n'.join(
+        _SEPARATORS.sub(' ', name.casefold()) + _NAME_END + _SEPARATORS.sub(' ', summary.casefold())
+        for _id, name, summary in mods
+    )
+
+    temporary = path.with_name('.{}.new'.format(path.name))
+    with temporary.open(mode='wb') as stream:
+        stream.write(_HEADER.pack(MAGIC, int(version.timestamp()), len(mods), len(blob)))
+        stream.write(records)
+        stream.write(b''.join(_ORDER.pack(i) for i in order))
+        stream.write(blob)
+        stream.write(folded.encode('utf-8'))
+    temporary.replace(path)
+
+    return len(mods)
+
+
+def path_of(database: Path) -> Path:
+    """Locate the catalogue exported from a database.
+
+    Keyword arguments:
+        database: Path to the database file.
+
+    Returns:
+        Path to the catalogue file, next to the database.
+    """
+
+    return database.with_suffix('.catalogue')
+
+
+def open_current(database: Path) -> Optional['Catalogue']:
+    """Open the catalogue exported from a database, if it is up to date.
+
+    The version of the database is read by the standard :mod:`sqlite3`,
+    so no database machinery is needed.
+
+    Keyword arguments:
+        database: Path to the database file.
+
+    Returns:
+        The opened catalogue, or None if it or the database does not exist,
+        or if it does not match the stored data.
+    """
+
+    try:
+        opened = Catalogue(path_of(database))
+    except (OSError, InvalidCatalogueError):
+        return None
+
+    uri = '{}?mode=ro'.format(database.as_uri())
+    try:
+        with closing(sqlite3.connect(uri, uri=True)) as conn:
+            timestamp, = conn.execute('PRAGMA user_version').fetchone()
+    except sqlite3.Error:
+        timestamp = None
+
+    if timestamp is None or int(opened.version.timestamp()) != timestamp:
+        opened.close()
+        return None
+    return opened
+
+
+class Catalogue:
+    """Memory-mapped catalogue of the mods.
+
+    The names are looked up ignoring their case, same as in the database.
+    """
+
+    __slots__ = 'version', '_map', '_count', '_order_start', '_blob_start', '_folded_start'
+
+    def __init__(self, path: Path):
+        """Open the catalogue file.
+
+        Keyword arguments:
+            path: The catalogue file to open.
+
+        Raises:
+            OSError: The file cannot be opened.
+            InvalidCatalogueError: The file is not a valid catalogue.
+        """
+
+        with path.open(mode='rb') as stream:
+            try:
+                self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as err:  # Empty file
+                raise InvalidCatalogueError(str(err)) from None
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise InvalidCatalogueError('Truncated catalogue: {}'.format(path))
+
+        magic, timestamp, self._count, blob_size = _HEADER.unpack_from(self._map)
+        self._order_start = _HEADER.size + self._count * _RECORD.size
+        self._blob_start = self._order_start + self._count * _ORDER.size
+        self._folded_start = self._blob_start + blob_size
+
+        if magic != MAGIC or len(self._map) < self._folded_start:
+            self.close()
+            raise InvalidCatalogueError('Invalid catalogue: {}'.format(path))
+
+        #: Version of the catalogued data
+        self.version = datetime.fromtimestamp(timestamp, timezone.utc)
+
+    def close(self) -> None:
+        """Release the mapped file."""
+
+        self._map.close()
+
+    def __enter__(self) -> 'Catalogue':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Entry]:
+        """Iterate over all mods, ordered by their ids."""
+
+        return (self._entry(i) for i in range(self._count))
+
+    def with_id(self, id: int) -> Entry:
+        """Find mod with id.
+
+        Keyword arguments:
+            id: The id of the mod.
+
+        Returns:
+            The requested mod.
+
+        Raises:
+            KeyError: No mod has the id.
+        """
+
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._id(middle) < id:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self._count or self._id(low) != id:
+            raise KeyError(id)
+        return self._entry(low)
+
+    def find(self, name: str) -> Entry:
+        """Find exactly one mod named NAME.
+
+        Keyword arguments:
+            name: The name of the mod.
+
+        Returns:
+            The requested mod.
+
+        Raises:
+            KeyError: No mod has the name.
+            ValueError: Multiple mods have the name.
+        """
+
+        key = name.casefold()
+        start = self._first_name(key)
+
+        found = list(self._names_from(start, lambda folded: folded == key, limit=2))
+        if not found:
+            raise KeyError(name)
+        if len(found) > 1:
+            raise ValueError('Multiple mods named {!r}'.format(name))
+        return found[0]
+
+    def complete(self, prefix: str, *, limit: Optional[int] = None) -> List[Entry]:
+        """Find mods whose names start with PREFIX.
+
+        Keyword arguments:
+            prefix: The start of the names.
+            limit: Maximal number of the mods; all of them if None.
+
+        Returns:
+            The matching mods, in case-insensitive alphabetical order
+            of their names.
+        """
+
+        key = prefix.casefold()
+        start = self._first_name(key)
+
+        return list(self._names_from(start, lambda folded: folded.startswith(key), limit=limit))
+
+    def search(self, term: str, *, limit: Optional[int] = None) -> List[Entry]:
+        """Find mods containing TERM in their name or summary.
+
+        Unlike in the database, the term is matched as a plain substring,
+        by scanning the case-folded texts of all the mods. The mods
+        matching by name come first.
+
+        Keyword arguments:
+            term: The term to search for.
+            limit: Maximal number of the mods; all of them if None.
+
+        Returns:
+            The matching mods, in case-insensitive alphabetical order
+            of their names within each of the two groups.
+        """
+
+        if not self._count:  # No text to split into the lines of the mods
+            return []
+
+        key = _SEPARATORS.sub(' ', term.casefold())
+        texts = self._map[self._folded_start:].decode('utf-8').split('\n')
+
+        by_name, by_summary = [], []
+        for record, text in enumerate(texts):
+            found = text.find(key)
+            if found == -1:
+                continue
+            if found < text.index(_NAME_END):
+                by_name.append(record)
+            else:
+                by_summary.append(record)
+
+        def ordered(records: List[int]) -> List[Entry]:
+            entries = [self._entry(r) for r in records]
+            return sorted(entries, key=lambda e: e.name.casefold())
+
+        return (ordered(by_name) + ordered(by_summary))[:limit]
+
+    # Raw access to the mapped data
+
+    def _id(self, record: int) -> int:
+        """Read id of the mod in a record."""
+
+        return _RECORD.unpack_from(self._map, _HEADER.size + record * _RECORD.size)[0]
+
+    def _string(self, offset: int, length: int) -> str:
+        """Read a string from the blob."""
+
+        start = self._blob_start + offset
+        return self._map[start:start + length].decode('utf-8')
+
+    def _entry(self, record: int) -> Entry:
+        """Read the mod in a record."""
+
+        id, name, name_len, summary, summary_len = _RECORD.unpack_from(
+            self._map, _HEADER.size + record * _RECORD.size,
+        )
+        return Entry(id, self._string(name, name_len), self._string(summary, summary_len))
+
+    def _record_of(self, position: int) -> int:
+        """Find the record at a position in the name order."""
+
+        return _ORDER.unpack_from(self._map, self._order_start + position * _ORDER.size)[0]
+
+    def _folded_name(self, position: int) -> str:
+        """Read the case-folded name at a position in the name order."""
+
+        offset = _HEADER.size + self._record_of(position) * _RECORD.size
+        name, name_len = _RECORD.unpack_from(self._map, offset)[1:3]
+        return self._string(name, name_len).casefold()
+
+    def _first_name(self, key: str) -> int:
+        """Find the first position in the name order not before KEY."""
+
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._folded_name(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _names_from(
+        self,
+        start: int,
+        matches: Callable[[str], bool],
+        *,
+        limit: Optional[int]
+    ) -> Iterator[Entry]:
+        """Provide mods in the name order from START while their names match."""
+
+        for position in range(start, self._count):
+            if limit is not None and position - start >= limit:
+                break
+            if not matches(self._folded_name(position)):
+                break
+            yield self._entry(self._record_of(position))
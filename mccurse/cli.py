@@ -1,24 +1,40 @@
-"""Command line interface to the package."""
+"""Command line interface to the package.
+
+The shell completion runs the whole program for every completion request,
+so only the modules it needs are imported up front. The database, network
+and terminal machinery is imported by the commands that use it.
+"""
 
 import curses
+import os
+import subprocess
+import sys
 from contextlib import contextmanager
+from datetime import timedelta
 from functools import partial
 from logging import ERROR, INFO
 from pathlib import Path
-from typing import Generator
+from typing import TYPE_CHECKING, Generator, List, Sequence
 
 import click
-import requests
 
-from . import _, log
-from .addon import Mod, Release
-from .exceptions import UserReport, AlreadyUpToDate
-from .curse import Game
-from .pack import ModPack
-from .proxy import Authorization
-from .tui import select_mod
-from .util import default_data_dir
+from . import _, log, catalogue, DATABASE_BASENAME, DOCUMENT_PARSER, STREAMING_PARSERS
+from .exceptions import UserReport, AlreadyInstalled, AlreadyUpToDate, ModNotFound
+from .util import default_cache_dir, default_data_dir
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm.session import Session as SQLSession  # noqa: F401
+    from .addon import Mod  # noqa: F401
+    from .curse import Game  # noqa: F401
+    from .pack import ModPack  # noqa: F401
+
 
+#: Game used unless the mod-pack specifies otherwise
+DEFAULT_GAME = 'Minecraft'
+#: Maximal number of offered completions
+COMPLETION_LIMIT = 100
+#: Commands searching the mods, which reuse the results of previous invocations
+SEARCHING_COMMANDS = frozenset({'search', 'install', 'remove', 'upgrade'})
 
 # Customized path types
 custom_path = partial(click.Path, resolve_path=True, path_type=str)
@@ -26,9 +42,73 @@ writable_file = partial(custom_path, writable=True, dir_okay=False)
 writable_dir = partial(custom_path, writable=True, file_okay=False)
 
 
+def find_mods(session: 'SQLSession', names: Sequence[str]) -> List['Mod']:
+    """Find mods by their names, suggesting similar ones if some does not exist.
+
+    Keyword arguments:
+        session: Database session to ask on.
+        names: The names of the mods.
+
+    Returns:
+        The requested mods, in the order of the names.
+
+    Raises:
+        ModNotFound: No mod of some name exists.
+    """
+
+    from .addon import Mod
+
+    found = Mod.find_many(session, names)
+
+    for name in names:
+        if name not in found:
+            raise ModNotFound(name, Mod.suggest(session, name))
+
+    return [found[name] for name in names]
+
+
+def complete_mods(ctx: click.Context, *args) -> List[str]:
+    """Complete names of the mods from the local database of the default game.
+
+    Usable as both click 7 `autocompletion` and click 8 `shell_complete`
+    callback -- the incomplete value is the last argument in both.
+    """
+
+    incomplete = args[-1]
+
+    # The game is not set up, so the completion does not wait for its schema
+    # upgrades or refreshes; only the catalogue of its database is read
+    database = default_cache_dir() / DATABASE_BASENAME.format(game_name=DEFAULT_GAME.lower())
+    if not database.exists():
+        return []
+
+    try:
+        mods = catalogue.open_current(database)
+        if mods is None:  # Not exported yet -- ask the database itself
+            from .addon import Mod
+            from .curse import Database
+
+            session = Database.of_game(DEFAULT_GAME).session()
+            return Mod.complete(session, incomplete, limit=COMPLETION_LIMIT)
+
+        with mods:
+            return [m.name for m in mods.complete(incomplete, limit=COMPLETION_LIMIT)]
+    except Exception:  # Completion must never break the shell
+        return []
+
+
+# Click 8 renamed the completion callback of the parameters
+try:
+    from click.shell_completion import CompletionItem  # noqa: F401
+except ImportError:
+    mods_argument = partial(click.argument, autocompletion=complete_mods)
+else:
+    mods_argument = partial(click.argument, shell_complete=complete_mods)
+
+
 # Mod-pack context
 @contextmanager
-def modpack_file(path: Path) -> Generator[ModPack, None, None]:
+def modpack_file(path: Path) -> Generator['ModPack', None, None]:
     """Context manager for manipulation of existing mod-pack.
 
     Keyword arguments:
@@ -39,6 +119,8 @@ def modpack_file(path: Path) -> Generator[ModPack, None, None]:
         is written (with changes) back to the file on context exit.
     """
 
+    from .pack import ModPack
+
     with path.open(encoding='utf-8', mode='r') as istream:
         mp = ModPack.load(istream)
 
@@ -48,19 +130,108 @@ def modpack_file(path: Path) -> Generator[ModPack, None, None]:
         mp.dump(ostream)
 
 
+def refresh_options(games: int = 1, *, parser: str = None) -> dict:
+    """Game construction options for refreshing data on this machine.
+
+    Keyword arguments:
+        games: Number of games to be refreshed at once.
+        parser: Name of the feed parser; selected automatically if None.
+
+    Returns:
+        Keyword arguments for :meth:`Game.find`.
+    """
+
+    cpus = os.cpu_count() or 1
+
+    return {
+        'pipelined': cpus > 1,
+        'workers': max(1, cpus // games),
+        'parser': parser,
+    }
+
+
+def refresh_in_background(game: 'Game') -> bool:
+    """Start refresh of the game data in a detached process.
+
+    Keyword arguments:
+        game: The game to refresh.
+
+    Returns:
+        True if the refresh was started, False if another refresh
+        is already running.
+    """
+
+    with game.database.lock(blocking=False) as acquired:
+        if not acquired:
+            return False
+
+    # The worker checks the lock again, in case of a race with another start
+    command = [sys.executable, '-m', __package__, '--quiet']
+    if game.feed.parser is not None:
+        command += ['--feed-parser', game.feed.parser]
+    command += ['refresh', '--background', game.name]
+    subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return True
+
+
+def save_lookup_cache(path: Path) -> None:
+    """Store the lookup cache for the next invocations, if it changed.
+
+    Keyword arguments:
+        path: The file to store the cache to.
+    """
+
+    from .addon import lookup_cache
+
+    msg = _('Lookup cache: {0.hits} hits, {0.misses} misses, {1} entries')
+    log.debug(msg.format(lookup_cache, len(lookup_cache)))
+
+    if not lookup_cache.modified:
+        return
+
+    try:
+        lookup_cache.dump(path)
+    except OSError as err:
+        log.debug(_('Lookup cache not stored: {}').format(err))
+
+
 @click.group()
 @click.version_option()
 @click.option('--refresh', is_flag=True, default=False,
-              help=_('Force refresh of existing mods list.'))
+              help=_('Check for a newer mods list now, regardless of its age.'))
 @click.option('--quiet', '-q', is_flag=True, default=False,
               help=_('Silence the process reporting.'))
+@click.option('--stale-after', type=click.FloatRange(min=0), default=24,
+              envvar='MCCURSE_STALE_AFTER', show_default=True,
+              help=_('Age of the mods list (in hours) which triggers its refresh.'))
+@click.option('--max-stale', type=click.FloatRange(min=0), default=7*24,
+              envvar='MCCURSE_MAX_STALE', show_default=True,
+              help=_('Age of the mods list (in hours) up to which it can be used '
+                     'while being refreshed in background.'))
+@click.option('--background/--foreground', default=True,
+              envvar='MCCURSE_BACKGROUND_REFRESH',
+              help=_('Refresh stale mods list in background, or wait for it.'))
+@click.option('--feed-parser', type=click.Choice(STREAMING_PARSERS + (DOCUMENT_PARSER,)),
+              default=None, envvar='MCCURSE_FEED_PARSER',
+              help=_('Parser of the feeds (the fastest available if not specified).'))
 @click.pass_context
-def cli(ctx, quiet, refresh):
+def cli(ctx, quiet, refresh, stale_after, max_stale, background, feed_parser):
     """Unofficial CLI client for Minecraft Curse Forge."""
 
+    from .addon import lookup_cache
+    from .curse import Game
+
     # Context for the subcommands
     ctx.obj = {
-        'default_game': Game.find('Minecraft'),  # Default game to query and use
+        # Default game to query and use; refresh it using all available cores
+        'default_game': Game.find(DEFAULT_GAME, **refresh_options(parser=feed_parser)),
+        'feed_parser': feed_parser,
         'token_path': default_data_dir() / 'token.yaml',  # Authorization token location
     }
 
@@ -70,11 +241,67 @@ def cli(ctx, quiet, refresh):
     curses.setupterm()
     # Setup appropriate logging level
     log.setLevel(INFO if not quiet else ERROR)
+    # Reuse results of the searches from previous invocations
+    if ctx.invoked_subcommand in SEARCHING_COMMANDS:
+        cache_path = default_cache_dir() / 'lookups.pickle'
+        lookup_cache.load(cache_path)
+        ctx.call_on_close(partial(save_lookup_cache, cache_path))
+
+    # Refresh game data if necessary; the refresh command does it on its own
+    if ctx.invoked_subcommand == 'refresh':
+        return
+
+    game = ctx.obj['default_game']
+    if not refresh and game.have_fresh_data(timedelta(hours=stale_after)):
+        return
+
+    # Stale, but usable data -- answer from them and refresh them meanwhile
+    usable = background and not refresh and game.have_fresh_data(timedelta(hours=max_stale))
+    if usable:
+        if refresh_in_background(game):
+            log.info(_('Refreshing game data in background.'))
+        return
+
+    log.info(_('Refreshing game data, please wait.'))
+    game.refresh_data()
 
-    # Refresh game data if necessary
-    if refresh or not ctx.obj['default_game'].have_fresh_data():
-        log.info(_('Refreshing game data, please wait.'))
-        ctx.obj['default_game'].refresh_data()
+
+@cli.command()
+@click.option('--all', 'every', is_flag=True, default=False,
+              help=_('Refresh all supported games.'))
+@click.option('--full', is_flag=True, default=False,
+              help=_('Re-create the data from the complete feeds.'))
+@click.option('--background', is_flag=True, default=False, hidden=True,
+              help=_('Skip the games already being refreshed.'))
+@click.argument('games', nargs=-1)
+@click.pass_obj
+def refresh(ctx, every, full, background, games):
+    """Refresh data of GAMES concurrently (default game if none specified)."""
+
+    from .curse import Game, refresh_games
+
+    supported = Game.supported_names()
+    unknown = {name.lower() for name in games} - set(supported)
+    if unknown:
+        msg = _('Game not supported: {}').format(', '.join(sorted(unknown)))
+        raise click.BadParameter(msg, param_hint='GAMES')
+
+    if every:
+        games = supported
+    elif not games:
+        games = [ctx['default_game'].name]
+
+    options = refresh_options(len(games), parser=ctx['feed_parser'])
+    selected = [Game.find(name, **options) for name in games]
+
+    log.info(_('Refreshing game data, please wait.'))
+    results = refresh_games(selected, incremental=not full, force=full, wait=not background)
+
+    for name, changed in sorted(results.items()):
+        if changed:
+            log.info(_('{name}: data refreshed').format_map(locals()))
+        else:
+            log.info(_('{name}: data already up to date').format_map(locals()))
 
 
 @cli.command()
@@ -85,6 +312,8 @@ def cli(ctx, quiet, refresh):
 def auth(ctx, user, password):
     """Authenticate user for subsequent file operations."""
 
+    from .proxy import Authorization
+
     token = Authorization.login(user, password)
     path = ctx['token_path']
 
@@ -93,10 +322,21 @@ def auth(ctx, user, password):
 
 
 @cli.command()
-@click.argument('name')
+@click.option('--limit', type=click.IntRange(min=1), default=None,
+              help=_('Maximal number of results to show.'))
+@click.option('--offset', type=click.IntRange(min=0), default=0,
+              help=_('Number of leading results to skip.'))
+@click.option('--sort', type=click.Choice(('relevance', 'popularity', 'downloads', 'name')),
+              default='relevance', help=_('Order of the results.'))
+@click.option('--category', metavar='CATEGORY',
+              help=_('Show only mods in the category.'))
+@click.argument('name', required=False, default='')
 @click.pass_obj
-def search(ctx, name):
-    """Search Curse Forge for a mod named NAME."""
+def search(ctx, limit, offset, sort, category, name):
+    """Search Curse Forge for a mod named NAME (all mods if not specified)."""
+
+    from .addon import Mod, NoResultFound
+    from .tui import select_mod
 
     search_result_description = {
         'header': _('Search results for "{name}"').format_map(locals()),
@@ -104,8 +344,21 @@ def search(ctx, name):
     }
 
     moddb = ctx['default_game'].database
-
-    results = Mod.search(moddb.session(), name)
+    session = moddb.session()
+
+    category_id = None
+    if category is not None:
+        try:
+            category_id = Mod.find_category(session, category)
+        except NoResultFound:
+            msg = _('Unknown category: {category}').format_map(locals())
+            raise click.BadParameter(msg, param_hint='--category')
+
+    # Loaded as the menu is scrolled through
+    results = Mod.iter_search(
+        session, name,
+        limit=limit, offset=offset, sort=sort, category=category_id,
+    )
     chosen = select_mod(results, **search_result_description)
 
     if chosen is not None:
@@ -138,6 +391,8 @@ release_option = click.option(
 def new(ctx, pack, path, gamever):
     """Create and initialize a new mod-pack."""
 
+    from .pack import ModPack
+
     # Check file system state
     pack_path = Path(pack)
     mods_path = Path(path)
@@ -160,63 +415,79 @@ def new(ctx, pack, path, gamever):
 @cli.command()
 @pack_option
 @release_option
-@click.argument('mod')
+@mods_argument('mods', nargs=-1, required=True)
 @click.pass_obj
-def install(ctx, pack, release, mod):
-    """Install new MOD into a mod-pack."""
+def install(ctx, pack, release, mods):
+    """Install new MODS into a mod-pack."""
+
+    import requests
+
+    from .addon import Release
+    from .proxy import Authorization
 
     with modpack_file(Path(pack)) as pack:
         moddb = pack.game.database
-        mod = Mod.find(moddb.session(), mod)
 
         proxy_session = requests.Session()
         with ctx['token_path'].open(encoding='utf-8') as token:
             proxy_session.auth = Authorization.load(token)
 
-        changes = pack.install_changes(
-            mod=mod,
-            min_release=Release[release.capitalize()],
-            session=proxy_session,
-        )
-        pack.apply(changes)
+        for mod in find_mods(moddb.session(), mods):
+            try:
+                changes = pack.install_changes(
+                    mod=mod,
+                    min_release=Release[release.capitalize()],
+                    session=proxy_session,
+                )
+            except AlreadyInstalled as report:
+                report.show()
+                continue
+
+            pack.apply(changes)
 
 
 @cli.command()
 @pack_option
-@click.argument('mod')
-def remove(pack, mod):
-    """Remove a MOD from a mod-pack."""
+@mods_argument('mods', nargs=-1, required=True)
+def remove(pack, mods):
+    """Remove MODS from a mod-pack."""
 
     with modpack_file(Path(pack)) as pack:
         moddb = pack.game.database
-        mod = Mod.find(moddb.session(), mod)
 
-        changes = pack.remove_changes(mod)
-        pack.apply(changes)
+        for mod in find_mods(moddb.session(), mods):
+            changes = pack.remove_changes(mod)
+            pack.apply(changes)
 
 
 @cli.command()
 @pack_option
 @release_option
-@click.argument('mod')
+@mods_argument('mods', nargs=-1, required=True)
 @click.pass_obj
-def upgrade(ctx, pack, release, mod):
-    """Upgrade MOD and its dependencies."""
+def upgrade(ctx, pack, release, mods):
+    """Upgrade MODS and their dependencies."""
+
+    import requests
+
+    from .addon import Release
+    from .proxy import Authorization
 
     with modpack_file(Path(pack)) as pack:
         moddb = pack.game.database
-        mod = Mod.find(moddb.session(), mod)
 
         proxy_session = requests.Session()
         with ctx['token_path'].open(encoding='utf-8') as token:
             proxy_session.auth = Authorization.load(token)
 
-        changes = pack.upgrade_changes(
-            mod=mod,
-            min_release=Release[release.capitalize()],
-            session=proxy_session,
-        )
-        if not changes:
-            raise AlreadyUpToDate(mod.name)
-
-        pack.apply(changes)
+        for mod in find_mods(moddb.session(), mods):
+            changes = pack.upgrade_changes(
+                mod=mod,
+                min_release=Release[release.capitalize()],
+                session=proxy_session,
+            )
+            if not changes:
+                AlreadyUpToDate(mod.name).show()
+                continue
+
+            pack.apply(changes)
@@ -6,29 +6,164 @@ and any other resources available from the Curse network.
 
 
 import bz2
-from contextlib import contextmanager
+import importlib
+import io
+import json
+import mmap
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from datetime import datetime, timezone, timedelta
-from functools import lru_cache
-from io import BytesIO
+from functools import lru_cache, partial
+from itertools import chain, islice
 from pathlib import Path
-from typing import TextIO, Type, Mapping
+from types import ModuleType
+from typing import Callable, ContextManager, Dict, Iterable, Mapping, MutableMapping
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple, Type, Union
 
 import attr
-import ijson
 import requests
 import sqlalchemy
 from attr import validators as vld
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session as SQLSession
+from sqlalchemy.pool import QueuePool
 
-from . import _, PKGDATA
-from .addon import AddonBase, Mod
-from .util import default_new_session, default_cache_dir, yaml
+from . import _, log, DATABASE_BASENAME, DOCUMENT_PARSER, PKGDATA, STREAMING_PARSERS
+from . import catalogue, schema
+from .addon import Mod
+from .schema import meta_table
+from .util import bzip2, default_new_session, default_cache_dir, file_lock, prefetched, yaml
 
 # Used exceptions -- make them available in this namespace
 from requests.exceptions import HTTPError  # noqa: F401
 
 SUPPORTED_GAMES = PKGDATA / 'supported_games.yaml'
 
+#: Signature of feed contents provider
+FeedFetcher = Callable[[], ContextManager[BinaryIO]]
+
+#: Version of a database without any data
+EPOCH = datetime.fromtimestamp(0, tz=timezone.utc)
+
+#: Connection pools and sessions shared by all instances of a database, by its path
+_CONNECTIONS = {}  # type: Dict[Path, Tuple[sqlalchemy.engine.Engine, scoped_session]]
+_CONNECTIONS_LOCK = threading.Lock()
+
+
+class BZ2ChunkReader(io.RawIOBase):
+    """Raw binary stream decompressing bz2 data from an iterable of chunks.
+
+    The chunks are pulled from the source only when the decompressed data
+    are requested, so only a small window of the compressed and decompressed
+    data is held in memory at any time. Multiple concatenated bz2 streams
+    are decompressed as one continuous stream, same as :func:`bz2.open` does.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        """Wrap the chunks.
+
+        Keyword arguments:
+            chunks: The bz2-compressed data, in arbitrarily sized pieces.
+        """
+
+        super().__init__()
+
+        self._chunks = iter(chunks)
+        self._decompressor = None  # No stream started yet
+
+    def _next_chunk(self) -> bytes:
+        """Provide next non-empty chunk of input, or empty bytes at its end."""
+
+        return next((c for c in self._chunks if c), b'')
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray) -> int:
+        """Decompress at most len(buffer) bytes into the buffer.
+
+        Returns:
+            Number of bytes decompressed, 0 at the end of the data.
+
+        Raises:
+            EOFError: The compressed data ended in the middle of a stream.
+        """
+
+        limit = len(buffer)
+
+        while True:
+            decompressor = self._decompressor
+
+            if decompressor is None or decompressor.eof:
+                # Start next stream, if any
+                leftover = decompressor.unused_data if decompressor else b''
+                leftover = leftover or self._next_chunk()
+                if not leftover:
+                    return 0
+
+                self._decompressor = decompressor = bz2.BZ2Decompressor()
+                data = decompressor.decompress(leftover, limit)
+            elif decompressor.needs_input:
+                chunk = self._next_chunk()
+                if not chunk:
+                    raise EOFError(
+                        'Compressed stream ended before the end-of-stream marker'
+                    )
+                data = decompressor.decompress(chunk, limit)
+            else:
+                data = decompressor.decompress(b'', limit)
+
+            if data:
+                size = len(data)
+                buffer[:size] = data
+                return size
+
+
+class ChunkReader(io.RawIOBase):
+    """Raw binary stream reading data from an iterable of chunks.
+
+    Closing the stream closes the iterable as well, if it supports it.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        """Wrap the chunks.
+
+        Keyword arguments:
+            chunks: The data, in arbitrarily sized pieces.
+        """
+
+        super().__init__()
+
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b'')
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray) -> int:
+        """Copy at most len(buffer) bytes into the buffer.
+
+        Returns:
+            Number of bytes copied, 0 at the end of the data.
+        """
+
+        if not self._pending:
+            self._pending = memoryview(next((c for c in self._chunks if c), b''))
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            getattr(self._chunks, 'close', lambda: None)()
+        super().close()
+
 
 @attr.s(slots=True)
 class Feed:
@@ -47,6 +182,10 @@ class Feed:
     _BASEURL = 'http://clientupdate-v6.cursecdn.com/feed/addons/{id}/v10'
     #: Complete feed suffix
     _COMPLETE_URL = 'complete.json.bz2'
+    #: Hourly feed suffix
+    _HOURLY_URL = 'hourly.json.bz2'
+    #: Size of network reads when streaming the feed, in bytes
+    _CHUNK_SIZE = 64 * 1024
 
     #: Curse internal game identification
     game_id = attr.ib(validator=vld.instance_of(int))
@@ -55,6 +194,18 @@ class Feed:
         validator=vld.optional(vld.instance_of(requests.Session)),
         default=None,
     )
+    #: Directory for local copies of the complete feed; None disables them
+    cache_dir = attr.ib(
+        validator=vld.optional(vld.instance_of(Path)),
+        default=None,
+    )
+    #: Download and decompress the feeds in a separate thread
+    pipelined = attr.ib(validator=vld.instance_of(bool), default=False)
+    #: Number of processes decompressing the local copy of complete feed
+    workers = attr.ib(validator=vld.instance_of(int), default=1)
+    #: Name of the feed parser; see :class:`FeedContents`. If None,
+    #: it is selected by the size of the feed.
+    parser = attr.ib(validator=vld.optional(vld.instance_of(str)), default=None)
 
     @property
     def complete_url(self) -> str:
@@ -73,31 +224,83 @@ class Feed:
 
         return self.complete_url + '.txt'
 
-    @staticmethod
+    @property
+    def hourly_url(self) -> str:
+        """Fully expanded URL of hourly feed."""
+
+        parts = (
+            self._BASEURL.format(id=self.game_id),
+            self._HOURLY_URL,
+        )
+
+        return '/'.join(parts)
+
+    @property
+    def hourly_timestamp_url(self) -> str:
+        """Fully expanded URL of hourly feed timestamp."""
+
+        return self.hourly_url + '.txt'
+
     @contextmanager
-    def _decode_contents(feed: bytes) -> TextIO:
-        """Decode the provided data from bz2 to text.
+    def _decode_contents(self, feed: Union[bytes, Iterable[bytes]]) -> BinaryIO:
+        """Decompress the provided bz2 data.
 
         The :arg:`feed` is assumed to be bz2-encoded text data in utf-8
-        encoding.
+        encoding. The data are decompressed lazily, as they are read.
+        If the feed is :attr:`pipelined`, the data are pulled and decompressed
+        in a separate thread, a few chunks ahead of the reader.
 
         Keyword arguments:
-            feed: The data to be decoded.
+            feed: The data to be decoded, either at once or in chunks.
 
-        Returns: Decoded text stream.
+        Returns: Decompressed binary stream.
         """
 
-        with BytesIO(feed) as compressed, \
-                bz2.open(compressed, mode='rt', encoding='utf-8') as stream:
+        if isinstance(feed, bytes):
+            feed = (feed,)
+
+        raw = BZ2ChunkReader(feed)
+        if self.pipelined:
+            decompressed = iter(partial(raw.read, self._CHUNK_SIZE), b'')
+            raw = ChunkReader(prefetched(decompressed, name='feed-decompression'))
+
+        with io.BufferedReader(raw) as stream:
             yield stream
 
     @contextmanager
-    def fetch_complete(self) -> TextIO:
-        """Provide complete feed contents.
+    def _decode_file(self, path: Path) -> BinaryIO:
+        """Decode bz2-compressed file by blocks in :attr:`workers` processes.
+
+        The file is assumed to contain text data in utf-8 encoding.
+        The blocks are decompressed a few at a time, as the data are read.
+
+        Keyword arguments:
+            path: The file to decode.
+
+        Returns: Decompressed binary stream.
+        """
+
+        with path.open('rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            decompressed = bzip2.decompress(data, workers=self.workers)
+            if self.pipelined:
+                decompressed = prefetched(decompressed, name='feed-decompression')
+
+            with io.BufferedReader(ChunkReader(decompressed)) as stream:
+                yield stream
+
+    @contextmanager
+    def _fetch(self, url: str) -> BinaryIO:
+        """Stream and decode feed contents from URL.
+
+        The feed is streamed from the network -- it is downloaded
+        and decompressed only as fast as the returned stream is read.
+
+        Keyword arguments:
+            url: The URL of the feed to fetch.
 
         Returns:
-            Text stream of complete feed contents, that should be used
-            in with-statement to be closed afterwards.
+            Binary stream of the feed contents, encoded in utf-8.
 
         Raises:
             requests.HTTPError: When an HTTP error occurs when fetching feed.
@@ -105,11 +308,218 @@ class Feed:
 
         session = default_new_session(self.session)
 
-        resp = session.get(self.complete_url)
-        resp.raise_for_status()
+        with closing(session.get(url, stream=True)) as resp:
+            resp.raise_for_status()
+
+            chunks = resp.iter_content(chunk_size=self._CHUNK_SIZE)
+            with self._decode_contents(chunks) as stream:
+                yield stream
+
+    def _cache_paths(self, url: str) -> Tuple[Path, Path]:
+        """Determine where to store local copy of a feed.
+
+        Keyword arguments:
+            url: The URL of the feed.
+
+        Returns:
+            Paths to the complete and to the partially downloaded copy.
+        """
+
+        name = '{}-{}'.format(self.game_id, url.rsplit('/', 1)[-1])
+        target = self.cache_dir / name
+
+        return target, target.with_name(name + '.part')
+
+    @staticmethod
+    def _read_validators(copy: Path) -> Dict[str, Optional[str]]:
+        """Read HTTP cache validators of a local copy."""
+
+        info = copy.with_name(copy.name + '.yaml')
+        if not copy.exists() or not info.exists():
+            return {}
+
+        with info.open(encoding='utf-8') as stream:
+            return yaml.load(stream) or {}
+
+    @staticmethod
+    def _write_validators(copy: Path, resp: requests.Response) -> None:
+        """Store HTTP cache validators of a local copy from a response."""
+
+        info = copy.with_name(copy.name + '.yaml')
+        validators = {
+            'etag': resp.headers.get('ETag'),
+            'last_modified': resp.headers.get('Last-Modified'),
+        }
+
+        with info.open(mode='w', encoding='utf-8') as stream:
+            yaml.dump(validators, stream)
+
+    def _read_chunks(self, copy: Path) -> Iterator[bytes]:
+        """Read a local copy of a feed in chunks."""
+
+        with copy.open(mode='rb') as stream:
+            yield from iter(lambda: stream.read(self._CHUNK_SIZE), b'')
+
+    @contextmanager
+    def _cached_source(
+        self,
+        url: str,
+        *,
+        offline: bool = False
+    ) -> Iterator[Tuple[Optional[Path], Iterator[bytes]]]:
+        """Provide feed data, keeping a local copy of them.
+
+        A complete local copy is used, if the server reports it is still
+        current. An interrupted download is resumed, if the server reports
+        that the partial copy is still current. Otherwise, the feed is
+        downloaded anew.
+
+        The data are provided as soon as they are available -- the download
+        is written to the local copy as it is read.
+
+        Keyword arguments:
+            url: The URL of the feed.
+            offline: Do not use the network at all, only the local copy.
+
+        Yields:
+            Path to the complete local copy, if it is used (None when
+            downloading), and the chunks of the feed data.
+
+        Raises:
+            requests.HTTPError: When an HTTP error occurs when fetching feed.
+            FileNotFoundError: When offline and there is no local copy.
+        """
 
-        with self._decode_contents(resp.content) as text:
-            yield text
+        target, incomplete = self._cache_paths(url)
+
+        if offline:
+            yield target, self._read_chunks(target)
+            return
+
+        headers = {}
+        validators = self._read_validators(target)
+        if validators:
+            conditions = (
+                ('If-None-Match', validators.get('etag')),
+                ('If-Modified-Since', validators.get('last_modified')),
+            )
+            headers.update((h, v) for h, v in conditions if v)
+
+        # Resume only if the partial copy can be validated
+        validators = self._read_validators(incomplete)
+        validator = validators.get('etag') or validators.get('last_modified')
+        if validator and incomplete.stat().st_size > 0:
+            headers['Range'] = 'bytes={}-'.format(incomplete.stat().st_size)
+            headers['If-Range'] = validator
+
+        session = default_new_session(self.session)
+        with closing(session.get(url, headers=headers, stream=True)) as resp:
+            if resp.status_code == requests.codes.not_modified:
+                yield target, self._read_chunks(target)
+                return
+
+            if resp.status_code != requests.codes.range_not_satisfiable:
+                resp.raise_for_status()
+
+                if resp.status_code == requests.codes.partial_content:
+                    mode = 'ab'
+                else:
+                    self._write_validators(incomplete, resp)
+                    mode = 'wb'
+
+                with closing(self._download(resp, url, mode=mode)) as chunks:
+                    yield None, chunks
+                return
+
+        # Unusable partial copy; start over
+        incomplete.unlink()
+        with self._cached_source(url) as source:
+            yield source
+
+    def _download(self, resp: requests.Response, url: str, *, mode: str) -> Iterator[bytes]:
+        """Provide the downloaded feed data, writing them to the local copy.
+
+        The local copy is marked complete once all the data are read.
+
+        Keyword arguments:
+            resp: The streamed response with the feed data.
+            url: The URL of the feed.
+            mode: Mode of opening the partial copy -- 'ab' to resume it.
+
+        Yields:
+            Chunks of the feed data, including the resumed partial copy.
+        """
+
+        target, incomplete = self._cache_paths(url)
+
+        if mode == 'ab':
+            yield from self._read_chunks(incomplete)
+
+        with incomplete.open(mode=mode) as copy:
+            for chunk in resp.iter_content(chunk_size=self._CHUNK_SIZE):
+                copy.write(chunk)
+                yield chunk
+
+        for suffix in ('.yaml', ''):
+            incomplete.with_name(incomplete.name + suffix).replace(
+                target.with_name(target.name + suffix)
+            )
+
+    @contextmanager
+    def fetch_complete(self, *, offline: bool = False) -> BinaryIO:
+        """Provide complete feed contents.
+
+        If the :attr:`cache_dir` is set, a local copy of the feed is kept
+        there and reused when possible. The reused copy is decompressed
+        in parallel, if more :attr:`workers` are allowed; downloaded feed
+        is decompressed as it arrives.
+
+        Keyword arguments:
+            offline: Do not use the network at all, only the local copy.
+
+        Returns:
+            Binary stream of complete feed contents, encoded in utf-8,
+            that should be used in with-statement to be closed afterwards.
+
+        Raises:
+            requests.HTTPError: When an HTTP error occurs when fetching feed.
+            FileNotFoundError: When offline and there is no local copy.
+        """
+
+        if offline:
+            if self.cache_dir is None or not self._cache_paths(self.complete_url)[0].exists():
+                raise FileNotFoundError(_('No local copy of the feed'))
+        elif self.cache_dir is None:
+            with self._fetch(self.complete_url) as stream:
+                yield stream
+            return
+
+        with self._cached_source(self.complete_url, offline=offline) as (copy, chunks):
+            # Only complete local copy can be split to blocks
+            if copy is not None and self.workers > 1:
+                with self._decode_file(copy) as stream:
+                    yield stream
+            else:
+                with self._decode_contents(chunks) as stream:
+                    yield stream
+
+    @contextmanager
+    def fetch_hourly(self) -> BinaryIO:
+        """Provide hourly feed contents.
+
+        The hourly feed contains only the add-ons that changed since
+        the publication of the complete feed.
+
+        Returns:
+            Binary stream of hourly feed contents, encoded in utf-8,
+            that should be used in with-statement to be closed afterwards.
+
+        Raises:
+            requests.HTTPError: When an HTTP error occurs when fetching feed.
+        """
+
+        with self._fetch(self.hourly_url) as stream:
+            yield stream
 
     @staticmethod
     def _decode_timestamp(ms_timestamp: int) -> datetime:
@@ -125,6 +535,52 @@ class Feed:
 
         return datetime.fromtimestamp(ms_timestamp/1000, timezone.utc)
 
+    def _fetch_timestamp(
+        self,
+        url: str,
+        validators: Optional[MutableMapping[str, Optional[str]]] = None
+    ) -> Optional[datetime]:
+        """Fetch and decode feed time signature from URL.
+
+        If validators are provided, the request is made conditional -- if
+        the server reports that the resource did not change since it was
+        last seen, no timestamp is returned. The validators are then updated
+        with the values provided by the server.
+
+        Keyword arguments:
+            url: The URL of the timestamp to fetch.
+            validators: HTTP cache validators of the last seen timestamp
+                (`etag` and `last_modified` keys).
+
+        Returns:
+            Datetime object pointed to the same point in time as the timestamp,
+            or None if the timestamp has not been modified.
+
+        Raises:
+            requests.HTTPError: When an HTTP error occurs while fetching.
+        """
+
+        session = default_new_session(self.session)
+
+        headers = {}
+        if validators is not None:
+            conditions = (
+                ('If-None-Match', validators.get('etag')),
+                ('If-Modified-Since', validators.get('last_modified')),
+            )
+            headers.update((h, v) for h, v in conditions if v)
+
+        resp = session.get(url, headers=headers)
+        if resp.status_code == requests.codes.not_modified:
+            return None
+        resp.raise_for_status()
+
+        if validators is not None:
+            validators['etag'] = resp.headers.get('ETag')
+            validators['last_modified'] = resp.headers.get('Last-Modified')
+
+        return self._decode_timestamp(int(resp.content))
+
     def fetch_complete_timestamp(self) -> datetime:
         """Provide current complete feed time signature.
 
@@ -137,12 +593,186 @@ class Feed:
             requests.HTTPError: When an HTTP error occurs while fetching.
         """
 
-        session = default_new_session(self.session)
+        return self._fetch_timestamp(self.complete_timestamp_url)
 
-        resp = session.get(self.complete_timestamp_url)
-        resp.raise_for_status()
+    def fetch_hourly_timestamp(
+        self,
+        validators: Optional[MutableMapping[str, Optional[str]]] = None
+    ) -> Optional[datetime]:
+        """Provide current hourly feed time signature.
 
-        return self._decode_timestamp(int(resp.content))
+        .. note:: The timestamp is assumed to be in UTC (as it should be).
+
+        Keyword arguments:
+            validators: HTTP cache validators of the last seen timestamp;
+                see :meth:`_fetch_timestamp` for details.
+
+        Returns:
+            Datetime object pointed to the same point in time as the timestamp,
+            or None if the timestamp has not been modified.
+
+        Raises:
+            requests.HTTPError: When an HTTP error occurs while fetching.
+        """
+
+        return self._fetch_timestamp(self.hourly_timestamp_url, validators)
+
+
+class InvalidFeedError(ValueError):
+    """The feed contents do not have the expected structure."""
+
+
+@lru_cache()
+def streaming_parser(name: Optional[str] = None) -> ModuleType:
+    """Load a streaming parser backend for the feed.
+
+    The pure-python backend is an order of magnitude slower than
+    the compiled ones, so a warning is logged when it is the fastest
+    one available.
+
+    Keyword arguments:
+        name: Name of the requested backend, one of :data:`STREAMING_PARSERS`.
+            If None, the fastest available backend is selected.
+
+    Returns:
+        The backend module.
+
+    Raises:
+        ValueError: Unknown backend name.
+        ImportError: The requested backend is not available.
+    """
+
+    if name is not None and name not in STREAMING_PARSERS:
+        msg = _('Unknown feed parser: {name}').format_map(locals())
+        raise ValueError(msg)
+
+    candidates = STREAMING_PARSERS if name is None else (name,)
+    for candidate in candidates:
+        try:
+            backend = importlib.import_module('ijson.backends.' + candidate)
+        except ImportError:
+            if candidate == name:
+                raise
+            continue
+
+        if candidate == 'python' and name is None:
+            log.warning(_('No compiled JSON parser available, reading feeds will be slow'))
+        log.debug(_('Using feed parser: {candidate}').format_map(locals()))
+
+        return backend
+
+
+@attr.s(slots=True)
+class FeedContents:
+    """Single-pass reader of the project feed contents.
+
+    The reader works directly on the parser event stream, and picks up
+    only the few fields it needs -- the add-ons are never constructed
+    as a whole. The feed's time signature is picked up along the way,
+    so it is available after all the add-ons were read.
+
+    For small feeds, the whole document can be parsed at once by the
+    :data:`DOCUMENT_PARSER` instead.
+    """
+
+    #: Extracted add-on fields, by their parser prefix
+    _FIELDS = {
+        'data.item.Id': 'Id',
+        'data.item.Name': 'Name',
+        'data.item.Summary': 'Summary',
+        'data.item.DownloadCount': 'DownloadCount',
+        'data.item.PopularityScore': 'PopularityScore',
+        'data.item.CategorySection.Path': 'Path',
+    }
+    #: Extracted category fields, by their parser prefix
+    _CATEGORY_FIELDS = {
+        'data.item.Categories.item.CategoryId': 'CategoryId',
+        'data.item.Categories.item.Name': 'Name',
+    }
+    #: Add-on fields passed along with the mods, if present
+    _OPTIONAL_FIELDS = 'DownloadCount', 'PopularityScore', 'Categories'
+
+    #: Binary stream of the feed contents, encoded in utf-8; the streaming
+    #: parsers read the bytes directly, without decoding them to text
+    stream = attr.ib()
+    #: Name of the parser to use; see :func:`streaming_parser`
+    parser = attr.ib(default=None)
+    #: Time signature of the feed, if already read
+    timestamp = attr.ib(default=None, init=False)
+
+    def mods(self) -> Iterator[Mapping]:
+        """Provide JSON data of the mods in the feed.
+
+        Yields:
+            Mapping with the `Id`, `Name` and `Summary` of each mod,
+            and its `DownloadCount`, `PopularityScore` and `Categories`
+            (`CategoryId` and `Name` of each) if present in the feed.
+
+        Raises:
+            ValueError: Unknown parser name.
+            ImportError: The requested parser is not available.
+        """
+
+        if self.parser == DOCUMENT_PARSER:
+            yield from self._document_mods()
+        else:
+            yield from self._streamed_mods()
+
+    def _document_mods(self) -> Iterator[Mapping]:
+        """Read the mods from the feed parsed as a whole."""
+
+        # The json module reads bytes only since Python 3.6
+        document = json.loads(self.stream.read().decode('utf-8'))
+
+        if 'timestamp' in document:
+            self.timestamp = Feed._decode_timestamp(document['timestamp'])
+
+        for addon in document.get('data', []):
+            if addon['CategorySection']['Path'] == 'mods':
+                mod = {k: addon[k] for k in ('Id', 'Name', 'Summary')}
+                mod.update((k, addon[k]) for k in self._OPTIONAL_FIELDS if k in addon)
+                yield mod
+
+    def _streamed_mods(self) -> Iterator[Mapping]:
+        """Read the mods from the parser event stream."""
+
+        backend = streaming_parser(self.parser)
+        fields, category_fields = self._FIELDS, self._CATEGORY_FIELDS
+        addon, category = {}, {}
+
+        for prefix, event, value in backend.parse(self.stream):
+            name = fields.get(prefix)
+            if name is not None:
+                addon[name] = value
+            elif prefix in category_fields:
+                category[category_fields[prefix]] = value
+            elif prefix == 'data.item':
+                if event == 'start_map':
+                    addon = {}
+                elif event == 'end_map' and addon.pop('Path', None) == 'mods':
+                    yield addon
+            elif prefix == 'data.item.Categories.item':
+                if event == 'start_map':
+                    category = {}
+                elif event == 'end_map':
+                    addon.setdefault('Categories', []).append(category)
+            elif prefix == 'timestamp' and event == 'number':
+                self.timestamp = Feed._decode_timestamp(value)
+
+    def signature(self) -> datetime:
+        """Provide the time signature of the read feed.
+
+        Returns:
+            The time signature.
+
+        Raises:
+            InvalidFeedError: The feed does not contain a time signature.
+        """
+
+        if self.timestamp is None:
+            raise InvalidFeedError(_('Feed does not contain a timestamp'))
+
+        return self.timestamp
 
 
 @attr.s(slots=True, cmp=False)
@@ -161,29 +791,70 @@ class Database:
     """
 
     _SCHEME = 'sqlite://'  #: DB URI scheme.
-    _BASENAME = '{game_name}-addons.sqlite'  #: DB URI basename format
+    _BASENAME = DATABASE_BASENAME  #: DB URI basename format
+    _SHADOW_BASENAME = '.{game_name}-addons.sqlite.new'  #: Replacement DB basename format
+    _BULK_CHUNK = 5000  #: Number of rows inserted by one bulk statement
+
+    _BUSY_TIMEOUT = 30  #: Seconds to wait for a lock held by another connection
+
+    #: Connection settings applied to each new connection
+    _CONNECT_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'temp_store': 'MEMORY',
+        'cache_size': '-16384',  # KiB
+        'mmap_size': '268435456',  # bytes
+    }
+
+    #: Connection settings trading durability for speed of bulk loads;
+    #: the write-ahead log cannot be left while other connections are open
+    _BULK_PRAGMAS = {
+        'synchronous': 'OFF',
+        'temp_store': 'MEMORY',
+        'cache_size': '-65536',  # KiB
+    }
 
     #: Name uniquely identifiyng the game.
     game_name = attr.ib(validator=vld.instance_of(str))
     #: Location of the database on the filesystem.
     root_dir = attr.ib(validator=vld.instance_of(Path))
+    #: Format of the database file name.
+    basename = attr.ib(validator=vld.instance_of(str), default=_BASENAME)
+
+    @classmethod
+    def of_game(cls, name: str, cache_dir: Path = None) -> 'Database':
+        """Locate the database of a game, without setting up anything else.
+
+        Keyword arguments:
+            name: Human-readable name of the game.
+            cache_dir: Path to the game's cache; the default one if None.
+
+        Returns:
+            The database of the game.
+        """
+
+        return cls(game_name=name.lower(), root_dir=default_cache_dir(cache_dir))
+
+    @property
+    def path(self) -> Path:
+        """Full path to the database file."""
+
+        return self.root_dir.resolve() / self.basename.format(game_name=self.game_name)
 
     @property
     def uri(self) -> str:
         """Constructs full DB URI for this database."""
 
-        return '/'.join((
-            self._SCHEME,
-            str(self.root_dir.resolve()),
-            self._BASENAME.format(game_name=self.game_name),
-        ))
+        return '/'.join((self._SCHEME, str(self.path)))
 
     @property
-    @lru_cache()
     def engine(self) -> sqlalchemy.engine.Engine:
-        """Provide connection pool for the database."""
+        """Provide connection pool for the database.
 
-        return sqlalchemy.create_engine(self.uri)
+        The pool is shared by all instances of the database with the same path.
+        """
+
+        return self._connections()[0]
 
     @property
     def version(self) -> datetime:
@@ -203,9 +874,441 @@ class Database:
             conn.execute(query)
 
     def session(self) -> SQLSession:
-        """Create new session for batch database communication."""
+        """Provide session for batch database communication.
+
+        The session is shared by all instances of the database with the same
+        path within the current thread, so the loaded objects are reused.
+        """
+
+        return self._connections()[1]()
+
+    def close(self) -> None:
+        """Drop all connections and sessions of the database.
+
+        New ones are created when the database is used again.
+        """
+
+        with _CONNECTIONS_LOCK:
+            connections = _CONNECTIONS.pop(self.path, None)
+
+        if connections is not None:
+            engine, sessions = connections
+            sessions.remove()
+            engine.dispose()
+
+    def _connections(self) -> Tuple[sqlalchemy.engine.Engine, scoped_session]:
+        """Provide the shared connection pool and session registry."""
+
+        path = self.path
+
+        with _CONNECTIONS_LOCK:
+            if path not in _CONNECTIONS:
+                engine = sqlalchemy.create_engine(
+                    self.uri,
+                    poolclass=QueuePool,
+                    connect_args={
+                        'timeout': self._BUSY_TIMEOUT,
+                        'check_same_thread': False,
+                    },
+                )
+                sqlalchemy.event.listen(engine, 'connect', self._configure)
+
+                sessions = scoped_session(sessionmaker(bind=engine))
+                _CONNECTIONS[path] = engine, sessions
+
+            return _CONNECTIONS[path]
+
+    def _configure(self, connection: sqlite3.Connection, record) -> None:
+        """Apply the connection settings to a new connection."""
+
+        # Cannot use SQL interpolation in PRAGMA statements
+        cursor = connection.cursor()
+        for name, value in self._CONNECT_PRAGMAS.items():
+            cursor.execute('PRAGMA {} = {}'.format(name, value))
+        cursor.close()
+
+    def _copy_from(self, source: 'Database') -> None:
+        """Replace the whole contents of the database by those of another one.
+
+        The schema and the data are copied in a single transaction.
+        The database uses write-ahead log, so the readers -- in this or
+        other processes -- keep reading the old contents until the copy
+        is committed. Only the other writers are waited for.
+
+        Tables defined the same way in both databases are kept and only
+        their rows are replaced, including the storage of the full-text
+        indexes. Other tables are re-created, and the full-text indexes
+        among them rebuilt from their contents.
+
+        Keyword arguments:
+            source: The database to copy.
+
+        Raises:
+            sqlite3.OperationalError: The other writers did not finish in time.
+        """
+
+        connection = sqlite3.connect(
+            str(self.path), timeout=self._BUSY_TIMEOUT, isolation_level=None,
+        )
+        try:
+            connection.execute('ATTACH DATABASE ? AS source', (str(source.path),))
+
+            def objects(schema: str) -> 'OrderedDict[str, Tuple[str, str]]':
+                query = (
+                    "SELECT name, type, sql FROM {}.sqlite_master"
+                    " WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'"
+                    " ORDER BY rowid"
+                )
+                rows = connection.execute(query.format(schema))
+                return OrderedDict((name, (type, sql)) for name, type, sql in rows)
+
+            def is_virtual(sql: str) -> bool:
+                return sql.upper().startswith('CREATE VIRTUAL TABLE')
+
+            def execute_each(statement: str, names: Iterable[str]) -> None:
+                for name in names:
+                    connection.execute(statement.format(name))
+
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                current, copied = objects('main'), objects('source')
+                kept = {name for name, entry in current.items() if copied.get(name) == entry}
+
+                # The triggers would index the copied rows once more;
+                # they are re-created after the copy
+                execute_each('DROP TRIGGER "{}"', (
+                    name for name, (type, _sql) in current.items() if type == 'trigger'
+                ))
+                execute_each('DROP TABLE "{}"', (
+                    name for name, (type, sql) in reversed(list(current.items()))
+                    if type == 'table' and is_virtual(sql) and name not in kept
+                ))
+                for name, (type, _sql) in reversed(list(current.items())):
+                    if type in {'table', 'view', 'index'} and name not in kept:
+                        connection.execute('DROP {} IF EXISTS "{}"'.format(type.upper(), name))
+
+                # Storage tables of the re-created virtual tables are created
+                # and filled along with them
+                existing = set(objects('main'))
+                created = []  # type: List[str]
+                for name, (type, sql) in copied.items():
+                    if type == 'table' and name not in existing:
+                        connection.execute(sql)
+                        if is_virtual(sql):
+                            created.append(name)
+                            existing.update(objects('main'))
+                        else:
+                            existing.add(name)
+
+                rebuilt = [name for name in created if 'USING FTS5(' in copied[name][1].upper()]
+                storage = {n for n in existing for v in created if n.startswith(v + '_')}
+                for name, (type, sql) in copied.items():
+                    if type != 'table' or is_virtual(sql) or name in storage:
+                        continue
+                    connection.execute('DELETE FROM main."{}"'.format(name))
+                    connection.execute(
+                        'INSERT INTO main."{0}" SELECT * FROM source."{0}"'.format(name)
+                    )
+
+                execute_each('INSERT INTO "{0}"("{0}") VALUES (\'rebuild\')', rebuilt)
+                for name, (type, sql) in copied.items():
+                    if type == 'trigger' or (type in {'index', 'view'} and name not in kept):
+                        connection.execute(sql)
+
+                version, = connection.execute('PRAGMA source.user_version').fetchone()
+                connection.execute('PRAGMA main.user_version = {:d}'.format(version))
+
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _tuned_for_bulk(self) -> sqlalchemy.engine.Connection:
+        """Provide connection tuned for loading large amounts of data.
+
+        The original settings are restored when the connection is returned.
+        """
+
+        with self.engine.connect() as conn:
+            original = {
+                name: conn.execute('PRAGMA {}'.format(name)).scalar()
+                for name in self._BULK_PRAGMAS
+            }
+
+            # Cannot use SQL interpolation in PRAGMA statements
+            setting = 'PRAGMA {} = {}'
+            for name, value in self._BULK_PRAGMAS.items():
+                conn.execute(setting.format(name, value))
+            try:
+                yield conn
+            finally:
+                for name, value in original.items():
+                    conn.execute(setting.format(name, value))
+
+    def bulk_load(
+        self,
+        table: sqlalchemy.Table,
+        rows: Iterable[Mapping],
+        *,
+        replace: bool = False
+    ) -> int:
+        """Insert large amount of rows into a table.
+
+        The rows are inserted in fixed-size chunks, each by a single
+        statement, without any ORM bookkeeping. The whole load is done
+        in a single transaction.
+
+        Keyword arguments:
+            table: The table to insert the rows into.
+            rows: The values to insert, as column name to value mappings.
+            replace: If True, the current contents of the table are removed
+                before the load. The table indexes are then re-created after
+                the load, instead of updating them with each insert.
+
+        Returns:
+            Number of inserted rows.
+        """
+
+        start = time.perf_counter()
+        count = 0
+
+        rows = iter(rows)
+        with self._tuned_for_bulk() as conn, conn.begin():
+            if replace:
+                conn.execute(table.delete())
+                for index in table.indexes:
+                    index.drop(conn)
+
+            for chunk in iter(lambda: list(islice(rows, self._BULK_CHUNK)), []):
+                conn.execute(table.insert(), chunk)
+                count += len(chunk)
+
+            if replace:
+                for index in table.indexes:
+                    index.create(conn)
+
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else count
+
+        msg = _('Stored {count} rows in {elapsed:.2f} s ({rate:.0f} rows/s)')
+        log.info(msg.format_map(locals()))
+
+        return count
+
+    def synchronize(
+        self,
+        table: sqlalchemy.Table,
+        rows: Iterable[Mapping],
+        *,
+        complete: bool = True,
+        counters: Sequence[str] = ()
+    ) -> Tuple[int, int, int]:
+        """Write rows into a table, skipping those already stored.
+
+        The table is expected to have an `id` primary key and a `digest`
+        column, containing a digest of the row contents. Only the rows
+        with an unknown key or with a digest different from the stored one
+        are written. Everything is done in a single transaction.
+
+        The counter columns are not covered by the digest, as they change
+        too often. For the otherwise unchanged rows, only the changed
+        counters are written, leaving the other columns (and their indexes)
+        untouched.
+
+        Keyword arguments:
+            table: The table to write the rows into.
+            rows: The values to write, as column name to value mappings.
+            complete: The rows are the complete table contents -- stored rows
+                not among them are deleted.
+            counters: Names of the counter columns.
+
+        Returns:
+            Numbers of inserted, updated and deleted rows; the rows with
+            only their counters updated are not counted.
+        """
+
+        key, digest = table.c.id, table.c.digest
+        keyed = key == sqlalchemy.bindparam('old_id')
+        count_update = table.update().where(keyed).values({
+            name: sqlalchemy.bindparam('new_' + name) for name in counters
+        })
+
+        inserted = updated = deleted = counted = 0
+
+        rows = iter(rows)
+        with self.engine.begin() as conn:
+            query = sqlalchemy.select([key, digest] + [table.c[name] for name in counters])
+            stored = {id: tuple(values) for id, *values in conn.execute(query)}
+
+            for chunk in iter(lambda: list(islice(rows, self._BULK_CHUNK)), []):
+                new, changed, recounted = [], [], []
+                for row in chunk:
+                    if row['id'] not in stored:
+                        new.append(row)
+                        continue
+
+                    old_digest, *old_counts = stored.pop(row['id'])
+                    if old_digest != row['digest']:
+                        changed.append(dict(row, old_id=row['id']))
+                    elif old_counts != [row.get(name) for name in counters]:
+                        values = {'new_' + name: row.get(name) for name in counters}
+                        recounted.append(dict(values, old_id=row['id']))
+
+                if new:
+                    conn.execute(table.insert(), new)
+                if changed:
+                    conn.execute(table.update().where(keyed), changed)
+                if recounted:
+                    conn.execute(count_update, recounted)
+
+                inserted += len(new)
+                updated += len(changed)
+                counted += len(recounted)
+
+            # Only the rows not present in the new contents are left
+            if complete and stored:
+                conn.execute(table.delete().where(keyed), [{'old_id': k} for k in stored])
+                deleted = len(stored)
+
+        msg = _('Inserted {inserted}, updated {updated} and deleted {deleted} rows')
+        log.info(msg.format_map(locals()))
+        if counted:
+            log.debug(_('Updated counters of {counted} rows').format_map(locals()))
+
+        return inserted, updated, deleted
+
+    def upgrade_schema(self) -> List[schema.Migration]:
+        """Bring the schema of the database up to date, keeping the stored data.
+
+        The migrations are done under the database lock, so that only one
+        process applies them.
+
+        Returns:
+            The applied migrations.
+        """
+
+        if schema.is_current(self.engine):
+            return []
+
+        with self.lock():
+            return schema.upgrade(self.engine)
+
+    @contextmanager
+    def replacement(self) -> 'Database':
+        """Provide new empty database, which will replace this one.
+
+        The replacement is built in a separate file next to this database,
+        so the current data can still be used in the meantime. When the
+        context exits without an exception, the replacement is copied over
+        the current contents in a single transaction, and its file is
+        removed. Otherwise, it is discarded and the current database is left
+        intact.
+
+        Returns:
+            The replacement database.
+        """
+
+        shadow = attr.evolve(self, basename=self._SHADOW_BASENAME)
+
+        def discard() -> None:
+            # The log of a discarded file must not be applied to the next one
+            shadow.close()
+            for suffix in ('', '-wal', '-shm'):
+                path = shadow.path.with_name(shadow.path.name + suffix)
+                if path.exists():
+                    path.unlink()
+
+        discard()  # Left over from an interrupted replacement
+        try:
+            yield shadow
+
+            shadow.close()
+            self._copy_from(shadow)
+        finally:
+            discard()
+
+    @property
+    def catalogue_path(self) -> Path:
+        """Full path to the catalogue of the mods, next to the database."""
+
+        return catalogue.path_of(self.path)
+
+    def export_catalogue(self) -> int:
+        """Write the catalogue of the stored mods, for lookups without the database.
+
+        Returns:
+            Number of the catalogued mods.
+        """
+
+        columns = Mod.__table__.c
+        query = sqlalchemy.select([columns.id, columns.name, columns.summary])
+
+        with self.engine.connect() as conn:
+            return catalogue.build(self.catalogue_path, conn.execute(query), version=self.version)
+
+    def open_catalogue(self) -> Optional[catalogue.Catalogue]:
+        """Open the catalogue of the stored mods, if it is up to date.
+
+        Returns:
+            The opened catalogue, or None if it does not exist
+            or does not match the stored data.
+        """
+
+        return catalogue.open_current(self.path)
+
+    @contextmanager
+    def lock(self, *, blocking: bool = True) -> Iterator[bool]:
+        """Provide lock of the database data, held across processes.
+
+        The lock is advisory -- only the processes refreshing the data
+        are expected to hold it, readers can use the data at any time.
+
+        Keyword arguments:
+            blocking: Wait for the lock, if it is already held.
 
-        return SQLSession(bind=self.engine)
+        Yields:
+            True if the lock was acquired, False if not (only when
+            not blocking).
+        """
+
+        path = self.path
+        with file_lock(path.with_name(path.name + '.lock'), blocking=blocking) as acquired:
+            yield acquired
+
+    def get_meta(self, *keys: str) -> Dict[str, Optional[str]]:
+        """Read auxiliary information stored along the data.
+
+        Keyword arguments:
+            keys: The keys of the information to read.
+
+        Returns:
+            Mapping of the keys to their stored values (None if not stored).
+        """
+
+        query = sqlalchemy.select([meta_table]).where(meta_table.c.key.in_(keys))
+
+        stored = dict.fromkeys(keys)
+        stored.update(tuple(row) for row in self.engine.execute(query))
+        return stored
+
+    def set_meta(self, values: Mapping[str, Optional[str]]) -> None:
+        """Store auxiliary information along the data.
+
+        Keyword arguments:
+            values: The keys and values to store. Keys with None values
+                are removed from the storage.
+        """
+
+        keys = list(values.keys())
+        present = [{'key': k, 'value': v} for k, v in values.items() if v is not None]
+
+        with self.engine.begin() as conn:
+            conn.execute(meta_table.delete().where(meta_table.c.key.in_(keys)))
+            if present:
+                conn.execute(meta_table.insert(), present)
 
 
 class UnsupportedGameError(ValueError):
@@ -222,6 +1325,9 @@ class Game:
     together in one neat package.
     """
 
+    #: Number of rows passed at once between pipelined stages
+    _PIPELINE_BATCH = 1000
+
     # Primary attributes – must be supplied by user
     id = attr.ib(validator=vld.instance_of(int))  #: Curse internal game ID
     name = attr.ib(validator=vld.instance_of(str))  #: Human-readable name
@@ -238,7 +1344,10 @@ class Game:
         version: str,
         *,
         session: requests.Session = None,
-        cache_dir: Path = None
+        cache_dir: Path = None,
+        pipelined: bool = False,
+        workers: int = 1,
+        parser: str = None
     ):
         """Initialize and create all the data for a game.
 
@@ -248,6 +1357,10 @@ class Game:
             version: Game version.
             session: :class:`requests.Session` to use for network calls.
             cache_dir: Path to the game's cache (which include mod database).
+            pipelined: Download and decompress, parse and store the feeds
+                in separate threads.
+            workers: Number of processes decompressing the complete feed.
+            parser: Name of the feed parser; selected automatically if None.
         """
 
         session = default_new_session(session)
@@ -257,21 +1370,33 @@ class Game:
         self.name = name
         self.version = version
 
-        self.database = Database(game_name=name.lower(), root_dir=cache_dir)
-        self.feed = Feed(game_id=id, session=session)
+        self.database = Database.of_game(name, cache_dir)
+        self.feed = Feed(
+            game_id=id,
+            session=session,
+            cache_dir=cache_dir,
+            pipelined=pipelined,
+            workers=workers,
+            parser=parser,
+        )
 
-        # Fill the database, if it does not exists
-        epoch = datetime.fromtimestamp(0, tz=timezone.utc)
-        if self.database.version == epoch:
-            AddonBase.metadata.create_all(self.database.engine)
+        # Create or upgrade the database structure
+        self.database.upgrade_schema()
 
     @classmethod
-    def find(cls: Type['Game'], name: str, *, gamedb: Path = SUPPORTED_GAMES) -> 'Game':
+    def find(
+        cls: Type['Game'],
+        name: str,
+        *,
+        gamedb: Path = SUPPORTED_GAMES,
+        **options
+    ) -> 'Game':
         """Find and create instance of a supported game.
 
         Keyword arguments:
             name: Name of the game to instantiate.
             gamedb: Path to the YAML dictionary of supported games.
+            options: Other keyword arguments for the game constructor.
 
         Returns:
             Instance of the supported game.
@@ -288,7 +1413,23 @@ class Game:
             msg = _("Game not supported: '{name}'").format_map(locals())
             raise UnsupportedGameError(msg)
 
-        return cls(name=name.capitalize(), **defaults)
+        return cls(name=name.capitalize(), **defaults, **options)
+
+    @classmethod
+    def supported_names(cls: Type['Game'], *, gamedb: Path = SUPPORTED_GAMES) -> List[str]:
+        """List names of all supported games.
+
+        Keyword arguments:
+            gamedb: Path to the YAML dictionary of supported games.
+
+        Returns:
+            The names, suitable for :meth:`find`.
+        """
+
+        with gamedb.open(encoding='utf-8') as gamestream:
+            games = yaml.load(gamestream)
+
+        return sorted(games.keys())
 
     @classmethod
     def from_yaml(cls: Type['Game'], data: Mapping) -> 'Game':
@@ -312,29 +1453,206 @@ class Game:
             'version': instance.version,
         }
 
-    def refresh_data(self):
-        """Download, store and index fresh version of the game add-ons."""
+    def refresh_data(
+        self,
+        *,
+        incremental: bool = True,
+        force: bool = False,
+        wait: bool = True
+    ) -> bool:
+        """Download, store and index fresh version of the game add-ons.
+
+        Only one process refreshes the data at a time. If another one
+        is already refreshing them, this one waits until it is done
+        and then uses the refreshed data, instead of repeating the work.
 
-        sess = self.database.session()
+        Keyword arguments:
+            incremental: Allow updating the data from the hourly feed.
+                If False and forced, the database is rebuilt.
+            force: Do not check if the feed is newer than stored data.
+            wait: Wait for the refresh running in another process.
+                Otherwise, return immediately.
 
-        # Destroy indexes and truncate old data
-        sess.query(Mod).delete()
+        Returns:
+            True if the stored data were changed, False otherwise
+            (including refresh by another process).
+        """
 
-        # Parse the feed's data
-        # TODO: Extract feed's timestamp from the JSON
-        with self.feed.fetch_complete() as feed:
-            addons = ijson.items(feed, 'data.item')
-            mods = filter(
-                lambda a: a['CategorySection']['Path'] == 'mods',
-                addons,
-            )
+        original = self.database.version
+
+        with self.database.lock(blocking=False) as acquired:
+            if acquired:
+                return self._refresh(incremental=incremental, force=force)
+
+        if not wait:
+            return False
+
+        msg = _('Waiting for another refresh of {self.name} data to finish.')
+        log.info(msg.format_map(locals()))
+
+        with self.database.lock():
+            if self.database.version != original:
+                return False  # Already refreshed
+            return self._refresh(incremental=incremental, force=force)
+
+    def _refresh(self, *, incremental: bool, force: bool) -> bool:
+        """Refresh the add-ons data, while holding the database lock.
+
+        At first, only the time signature of the hourly feed is checked.
+        If it is not newer than the stored data (or the server reports
+        that it has not been modified since the last refresh),
+        nothing else is downloaded.
+
+        When the stored data are not older than the complete feed, only
+        the add-ons changed since then (listed in the hourly feed) are
+        updated. Otherwise, the data are compared with the complete feed
+        and only the differences are written.
+
+        An empty or outdated database is rebuilt from the complete feed.
+
+        Keyword arguments:
+            incremental: Allow updating the data from the hourly feed.
+                If False and forced, the database is rebuilt.
+            force: Do not check if the feed is newer than stored data.
+
+        Returns:
+            True if the stored data were changed, False otherwise.
+        """
 
-            sess.add_all(Mod.from_json(m) for m in mods)
+        # The database version is stored without the fractional part
+        current = self.database.version
 
-        sess.commit()
+        # No need to check anything, the complete feed is needed anyway
+        if current == EPOCH or (force and not incremental):
+            self._replace_from(self.feed.fetch_complete)
+            return True
 
-        # Write the timestamp
-        self.database.version = self.feed.fetch_complete_timestamp()
+        validators = {} if force else self.database.get_meta('etag', 'last_modified')
+
+        hourly_version = self.feed.fetch_hourly_timestamp(validators)
+        if not force:
+            if hourly_version is None or current >= hourly_version.replace(microsecond=0):
+                return False  # Nothing new
+
+        complete_version = self.feed.fetch_complete_timestamp()
+        if incremental and current >= complete_version.replace(microsecond=0):
+            self._update_from(self.feed.fetch_hourly, complete=False)
+        else:
+            self._update_from(self.feed.fetch_complete, complete=True)
+
+        self.database.set_meta(validators)
+        return True
+
+    def reimport_data(self) -> None:
+        """Re-create the stored add-ons from the local copy of complete feed.
+
+        No network communication is done, the local copy is imported
+        as it is.
+
+        Raises:
+            FileNotFoundError: There is no local copy of the feed.
+        """
+
+        with self.database.lock():
+            self._replace_from(partial(self.feed.fetch_complete, offline=True))
+
+    def _replace_from(self, fetch: FeedFetcher) -> None:
+        """Replace all the stored add-ons with the contents of a feed.
+
+        The version of the stored data is set to the feed's time signature.
+
+        Keyword arguments:
+            fetch: The function providing the feed contents.
+
+        Raises:
+            InvalidFeedError: The feed does not contain its time signature.
+        """
+
+        # Build the new data aside, so that the old ones are available
+        # until the new ones are complete
+        with self.database.replacement() as shadow:
+            schema.upgrade(shadow.engine)
+            # Index all the mods at once, instead of one by one
+            Mod.drop_search_index(shadow.engine)
+
+            categories = {}  # type: Dict[int, Tuple[Tuple[int, str], ...]]
+            with fetch() as feed:
+                contents = FeedContents(feed, parser=self.feed.parser)
+                with closing(self._feed_rows(contents, categories)) as rows:
+                    shadow.bulk_load(Mod.__table__, rows, replace=True)
+
+            Mod.store_categories(shadow.engine, categories)
+            schema.ensure_search_index(shadow.engine)
+            shadow.version = contents.signature()
+
+        self.database.export_catalogue()
+
+    def _update_from(self, fetch: FeedFetcher, *, complete: bool) -> None:
+        """Update the stored add-ons with the contents of a feed.
+
+        Only the add-ons that actually changed are written to the database.
+        The version of the stored data is set to the feed's time signature.
+
+        Keyword arguments:
+            fetch: The function providing the feed contents.
+            complete: The feed contains all the add-ons, not only the changed
+                ones. Stored add-ons missing from it are removed.
+
+        Raises:
+            InvalidFeedError: The feed does not contain its time signature.
+        """
+
+        # Incremental updates are small enough to be parsed at once
+        parser = self.feed.parser
+        if parser is None and not complete:
+            parser = DOCUMENT_PARSER
+
+        categories = {}  # type: Dict[int, Tuple[Tuple[int, str], ...]]
+        with fetch() as feed:
+            contents = FeedContents(feed, parser=parser)
+            with closing(self._feed_rows(contents, categories)) as rows:
+                self.database.synchronize(
+                    Mod.__table__, rows,
+                    complete=complete, counters=Mod.COUNTER_COLUMNS,
+                )
+
+        Mod.store_categories(self.database.engine, categories, complete=complete)
+
+        self.database.version = contents.signature()
+        self.database.export_catalogue()
+
+    def _feed_rows(
+        self,
+        contents: FeedContents,
+        categories: Dict[int, Tuple[Tuple[int, str], ...]]
+    ) -> Iterator[Mapping]:
+        """Provide database rows of the mods in the feed.
+
+        If the feed is pipelined, the feed is parsed in a separate thread,
+        while the previous rows are being stored.
+
+        Keyword arguments:
+            contents: The feed contents to read the mods from.
+            categories: Mapping to fill with the categories of the read mods,
+                by the mod ids; complete once all the rows were provided.
+
+        Yields:
+            The :class:`Mod` table rows.
+        """
+
+        def row(jobj: Mapping) -> Mapping:
+            categories[jobj['Id']] = Mod.categories_from_json(jobj)
+            return Mod.row_from_json(jobj)
+
+        rows = map(row, contents.mods())
+        if not self.feed.pipelined:
+            yield from rows
+            return
+
+        # Pass the rows in batches, to keep the hand-over cheap
+        batches = iter(lambda: list(islice(rows, self._PIPELINE_BATCH)), [])
+        with closing(prefetched(batches, name='feed-parsing')) as parsed:
+            yield from chain.from_iterable(parsed)
 
     def have_fresh_data(
         self,
@@ -358,3 +1676,55 @@ class Game:
 
         time_passed = now - self.database.version
         return time_passed < valid_period
+
+
+def refresh_games(
+    games: Iterable[Game],
+    *,
+    threads: int = None,
+    **options
+) -> Dict[str, bool]:
+    """Refresh data of several games concurrently.
+
+    Each game is refreshed in its own thread, so that the network
+    communication, decompression and database writes of different games
+    overlap. Each game writes into its own database file.
+
+    A failed refresh does not interrupt the others; the first failure
+    is re-raised after all the refreshes end.
+
+    Keyword arguments:
+        games: The games to refresh.
+        threads: Maximal number of games refreshed at once;
+            all of them by default.
+        options: Keyword arguments for :meth:`Game.refresh_data`.
+
+    Returns:
+        Mapping of game names to the result of their refresh.
+    """
+
+    games = list(games)
+    if not games:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=threads or len(games)) as pool:
+        running = [
+            (game, pool.submit(game.refresh_data, **options))
+            for game in games
+        ]
+
+    results, failure = {}, None
+    for game, result in running:
+        error = result.exception()
+        if error is None:
+            results[game.name] = result.result()
+            continue
+
+        msg = _('Refresh of {game.name} data failed: {error!s}')
+        log.error(msg.format_map(locals()))
+        failure = failure or error
+
+    if failure is not None:
+        raise failure
+
+    return results
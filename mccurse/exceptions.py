@@ -77,6 +77,32 @@ class NoFileFound(UserReport):
     header = _('No available file found for mod')
 
 
+class ModNotFound(UserReport):
+    """No mod with requested name is known."""
+
+    header = _('Mod not found')
+
+    def __init__(self, name: str, suggestions: Sequence['Mod'] = ()):
+        super().__init__(name)
+
+        self.name = name
+        self.suggestions = suggestions
+
+    def format_message(self):
+        """Format: {name}, with list of suggested names if any."""
+
+        if not self.suggestions:
+            return self.name
+
+        separator = '\n\t- '
+        return '{name}\n{question}{sep}{lst}'.format(
+            name=self.name,
+            question=_('Did you mean:'),
+            sep=separator,
+            lst=separator.join(m.name for m in self.suggestions),
+        )
+
+
 class NotInstalled(UserReport):
     """Requested mod is not installed."""
 
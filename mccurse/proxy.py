@@ -10,10 +10,10 @@ from attr import validators as vld
 from requests.auth import AuthBase
 
 from . import _
-from .addon import File, Mod, Release
+from .addon import File, Mod, NoResultFound, Release
 from .exceptions import InvalidStream
 from .curse import Game
-from .util import default_new_session, yaml, lazydict
+from .util import default_new_session, yaml
 
 
 HOME_URL = 'https://curse-rest-proxy.azurewebsites.net/api'
@@ -210,11 +210,24 @@ def latest_file_tree(
     if main is None:  # No file available
         return []
 
-    pool = lazydict(lambda m_id: latest(
-        game=game,
-        mod=Mod.with_id(game.database.session(), m_id),
-        min_release=min_release,
-        session=session,
-    ))
+    # Fetch the files level by level, looking up each level's mods at once
+    moddb = game.database.session()
+    pool = {}
+    wanted = set(main.dependencies) - {main.mod.id}
+
+    while wanted:
+        mods = Mod.with_ids(moddb, wanted)
+        missing = wanted - mods.keys()
+        if missing:
+            raise NoResultFound(_('Unknown mods: {}').format(sorted(missing)))
+
+        for m_id in wanted:
+            pool[m_id] = latest(game, mods[m_id], min_release, session=session)
+
+        wanted = {
+            dep_id
+            for file in map(pool.get, wanted) if file is not None
+            for dep_id in file.dependencies
+        } - pool.keys() - {main.mod.id}
 
     return [f for f in resolve(main, pool).values() if f is not None]
@@ -0,0 +1,285 @@
+"""Versioning and migrations of the database schema.
+
+Each database records the migrations applied to its schema. When it is
+opened, the pending migrations are applied in order, each one in its own
+transaction, so the stored data are kept instead of being re-imported
+from the feed.
+
+Missing tables are always created directly, with their current structure;
+the migrations take care of the changes to the existing tables -- new
+columns, indexes and the like. Newly created databases thus have the
+current schema right away; the migrations only check it there.
+
+The full-text search indexes are optional: when the SQLite library
+does not support them, their migration is still recorded, and the version
+of the library is stored instead. The indexes are tried again only when
+the database is opened with another version of the library.
+"""
+
+import sqlite3
+from typing import Callable, List, NamedTuple, Optional, Set
+
+import sqlalchemy
+from sqlalchemy import Column, Integer, String, bindparam
+from sqlalchemy.engine import Connectable, Connection
+
+from . import _, log
+from .addon import AddonBase, Mod, fold_name
+
+#: Migrations applied to the database
+schema_table = sqlalchemy.Table(
+    'schema_version', AddonBase.metadata,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('description', String),
+)
+
+#: Key-value storage of auxiliary information about the stored data
+meta_table = sqlalchemy.Table(
+    'meta', AddonBase.metadata,
+    Column('key', String, primary_key=True),
+    Column('value', String),
+)
+
+#: Meta key of the SQLite version which lacks the full-text search indexes
+SEARCH_UNAVAILABLE = 'search_index_unavailable'
+
+#: Single step of the schema evolution
+Migration = NamedTuple('Migration', [
+    ('version', int),
+    ('description', str),
+    ('apply', Callable[[Connection], None]),
+])
+
+#: Known migrations, in order of their versions
+MIGRATIONS = []  # type: List[Migration]
+
+
+def migration(description: str) -> Callable:
+    """Register decorated function as the next migration of the schema.
+
+    The function is called with a connection in an open transaction.
+    It should expect the database in any state older than the previous
+    migrations, as the databases created before the versioning
+    are not marked with any version; new databases are passed to it
+    with the current schema.
+
+    Keyword arguments:
+        description: Human-readable description of the migration.
+    """
+
+    def register(apply: Callable[[Connection], None]) -> Callable:
+        MIGRATIONS.append(Migration(len(MIGRATIONS) + 1, description, apply))
+        return apply
+
+    return register
+
+
+def latest_version() -> int:
+    """Version of the current schema."""
+
+    return len(MIGRATIONS)
+
+
+def current_version(connection: Connectable) -> Optional[int]:
+    """Find out the version of the schema of a database.
+
+    Keyword arguments:
+        connection: The database connection to use.
+
+    Returns:
+        The version of the latest applied migration, 0 for databases
+        created before the versioning, or None for databases without
+        any tables.
+    """
+
+    applied = applied_versions(connection)
+    if applied is None:
+        return None
+
+    return max(applied, default=0)
+
+
+def applied_versions(connection: Connectable) -> Optional[Set[int]]:
+    """Find out which migrations were applied to a database.
+
+    Keyword arguments:
+        connection: The database connection to use.
+
+    Returns:
+        The versions of the applied migrations (empty for databases
+        created before the versioning), or None for databases without
+        any tables.
+    """
+
+    tables = set(sqlalchemy.inspect(connection).get_table_names())
+    if schema_table.name not in tables:
+        return set() if Mod.__tablename__ in tables else None
+
+    query = sqlalchemy.select([schema_table.c.version])
+    return {version for version, in connection.execute(query)}
+
+
+def is_current(connection: Connectable) -> bool:
+    """Check if the schema of a database is up to date.
+
+    Keyword arguments:
+        connection: The database connection to use.
+    """
+
+    applied = applied_versions(connection)
+    if applied is None or not all(m.version in applied for m in MIGRATIONS):
+        return False
+
+    return not _retry_search_index(connection)
+
+
+def ensure_search_index(connection: Connectable) -> bool:
+    """Create the full-text search indexes, remembering if SQLite lacks them.
+
+    Keyword arguments:
+        connection: The database connection to use.
+
+    Returns:
+        True if all the indexes are available, False if the SQLite
+        library does not support some of them.
+    """
+
+    available = Mod.ensure_search_index(connection)
+
+    connection.execute(meta_table.delete().where(meta_table.c.key == SEARCH_UNAVAILABLE))
+    if not available:
+        connection.execute(meta_table.insert(), {
+            'key': SEARCH_UNAVAILABLE, 'value': sqlite3.sqlite_version,
+        })
+
+    return available
+
+
+def _retry_search_index(connection: Connectable) -> bool:
+    """Check if the search indexes were missing with another SQLite library."""
+
+    query = sqlalchemy.select([meta_table.c.value]).where(meta_table.c.key == SEARCH_UNAVAILABLE)
+    lacking = connection.execute(query).scalar()
+    return lacking is not None and lacking != sqlite3.sqlite_version
+
+
+def upgrade(connection: Connectable) -> List[Migration]:
+    """Bring the schema of a database up to date.
+
+    Keyword arguments:
+        connection: The database connection to use.
+
+    Returns:
+        The applied migrations; empty for new databases.
+    """
+
+    with connection.connect() as conn:
+        applied = applied_versions(conn)
+        AddonBase.metadata.create_all(conn)
+
+        # New database -- the migrations only check the current schema
+        new = applied is None
+        pending = [m for m in MIGRATIONS if new or m.version not in applied]
+        done = []  # type: List[Migration]
+        for step in pending:
+            with conn.begin():
+                step.apply(conn)
+                conn.execute(schema_table.insert(), {
+                    'version': step.version, 'description': step.description,
+                })
+
+            if not new:
+                done.append(step)
+                msg = _('Database schema upgraded: {step.description}')
+                log.info(msg.format_map(locals()))
+
+        if _retry_search_index(conn):
+            with conn.begin():
+                ensure_search_index(conn)
+
+        return done
+
+
+# Helpers for the migrations
+
+def add_column(connection: Connection, column: Column) -> bool:
+    """Add a column to its table, with its indexes.
+
+    Keyword arguments:
+        connection: The database connection to use.
+        column: The column definition.
+
+    Returns:
+        True if the column was added, False if it already exists.
+    """
+
+    table = column.table
+    stored = sqlalchemy.inspect(connection).get_columns(table.name)
+    if any(c['name'] == column.name for c in stored):
+        return False
+
+    connection.execute('ALTER TABLE {} ADD COLUMN {} {}'.format(
+        table.name, column.name, column.type.compile(connection.dialect),
+    ))
+    for index in table.indexes:
+        if column in index.columns.values():
+            add_index(connection, index)
+
+    return True
+
+
+def add_index(connection: Connection, index: sqlalchemy.Index) -> bool:
+    """Create an index, if it does not exist yet.
+
+    Keyword arguments:
+        connection: The database connection to use.
+        index: The index definition.
+
+    Returns:
+        True if the index was created, False if it already exists.
+    """
+
+    stored = sqlalchemy.inspect(connection).get_indexes(index.table.name)
+    if any(i['name'] == index.name for i in stored):
+        return False
+
+    index.create(connection)
+    return True
+
+
+# The migrations
+
+@migration('Store digests of the mods')
+def _store_digests(connection: Connection) -> None:
+    # Missing digests differ from all the new ones,
+    # so the next refresh rewrites all the mods
+    add_column(connection, Mod.__table__.c.digest)
+
+
+@migration('Store case-folded names of the mods')
+def _store_name_keys(connection: Connection) -> None:
+    table = Mod.__table__
+    if not add_column(connection, table.c.name_key):
+        return
+
+    names = connection.execute(sqlalchemy.select([table.c.id, table.c.name]))
+    keys = [{'old_id': id, 'key': fold_name(name)} for id, name in names]
+    if keys:
+        update = table.update().where(table.c.id == bindparam('old_id'))
+        connection.execute(update.values(name_key=bindparam('key')), keys)
+
+
+@migration('Create full-text search indexes')
+def _create_search_indexes(connection: Connection) -> None:
+    # Without FTS5, the search falls back to plain queries;
+    # the indexes are tried again with another SQLite library
+    ensure_search_index(connection)
+
+
+@migration('Store popularity and categories of the mods')
+def _store_popularity(connection: Connection) -> None:
+    # The categories are new tables, created directly; the digests
+    # do not cover the new data yet, so the next complete refresh
+    # rewrites all the mods with them
+    add_column(connection, Mod.__table__.c.downloads)
+    add_column(connection, Mod.__table__.c.popularity)
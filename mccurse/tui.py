@@ -1,7 +1,8 @@
 """Interactive text user interface parts."""
 
 import curses
-from typing import Callable, Sequence, Iterable, Optional
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
 
 import urwid
 
@@ -12,6 +13,81 @@ from .curse import Mod
 ModItemCallback = Callable[[Mod, urwid.Button], None]
 
 
+class LazyListWalker(urwid.ListWalker):
+    """List walker pulling the widgets from an iterator as they are needed.
+
+    Only the widgets up to the displayed ones are ever created, so long
+    lists can be shown without waiting for (or holding) all of them.
+    """
+
+    def __init__(self, widgets: Iterable[urwid.Widget]):
+        """Wrap the widgets.
+
+        Keyword arguments:
+            widgets: The widgets to walk through.
+        """
+
+        self._source = iter(widgets)  # type: Iterator[urwid.Widget]
+        self._loaded = []
+        self.focus = 0
+
+    def __getitem__(self, position: int) -> urwid.Widget:
+        """Provide widget at position, pulling it from the source if needed.
+
+        Raises:
+            IndexError: No widget at the position.
+        """
+
+        if position < 0:
+            raise IndexError(position)
+
+        missing = position + 1 - len(self._loaded)
+        if missing > 0:
+            self._loaded.extend(islice(self._source, missing))
+
+        return self._loaded[position]
+
+    def next_position(self, position: int) -> int:
+        """Position of the widget after the one at position."""
+
+        return position + 1
+
+    def prev_position(self, position: int) -> int:
+        """Position of the widget before the one at position."""
+
+        return position - 1
+
+    def positions(self, reverse: bool = False) -> Iterator[int]:
+        """Provide all the positions, in order (used for the Home/End keys).
+
+        The forward positions are provided as the widgets are pulled
+        from the source; the reverse ones need the whole source first.
+
+        Keyword arguments:
+            reverse: Provide the positions from the last one.
+        """
+
+        if reverse:
+            self._loaded.extend(self._source)
+            yield from reversed(range(len(self._loaded)))
+            return
+
+        position = 0
+        while True:
+            try:
+                self[position]
+            except IndexError:
+                return
+            yield position
+            position += 1
+
+    def set_focus(self, position: int) -> None:
+        """Move the focus to position."""
+
+        self.focus = position
+        self._modified()
+
+
 class ModMenu(urwid.ListBox):
     """Menu presenting a choice from a list of :class:`Mod`s.
 
@@ -63,15 +139,16 @@ class ModMenu(urwid.ListBox):
             pile = btn, text
             super().__init__(pile)
 
-    def __init__(self, choices: Sequence[Mod]):
+    def __init__(self, choices: Iterable[Mod]):
         """Create menu for choices.
 
         Keyword arguments:
-            choices: The :class:`Mod`s to choose from.
+            choices: The :class:`Mod`s to choose from. They are consumed
+                only as they are displayed.
         """
 
-        items = [self.Item(m, self.choose, self.end_loop) for m in choices]
-        super().__init__(urwid.SimpleFocusListWalker(items))
+        items = (self.Item(m, self.choose, self.end_loop) for m in choices)
+        super().__init__(LazyListWalker(items))
 
         self.chosen = None
 
@@ -103,7 +180,7 @@ def exit_loop_on_q_esc(key: str):
 
 
 def select_mod(
-    choices: Sequence[Mod],
+    choices: Iterable[Mod],
     header: Optional[str] = None,
     footer: Optional[str] = None,
 ) -> Optional[Mod]:
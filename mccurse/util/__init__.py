@@ -1,15 +1,23 @@
 """Various utilities and language enhancements."""
 
 
+import fcntl
+import queue
+import threading
 from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Callable, Hashable
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Iterator, TypeVar
 
-import requests
 import xdg.BaseDirectory
 
 from .. import RESOURCE_NAME
 
+if TYPE_CHECKING:  # Imported on demand, see default_new_session
+    import requests  # noqa: F401
+
+T = TypeVar('T')
+
 
 # Filesystem standard directories
 def default_cache_dir(directory: Path = None) -> Path:
@@ -34,11 +42,14 @@ def default_data_dir(directory: Path = None) -> Path:
         return directory
 
 
-def default_new_session(session: requests.Session = None) -> requests.Session:
+def default_new_session(session: 'requests.Session' = None) -> 'requests.Session':
     """Create new Requests' Session, if none is provided.
     Otherwise, return session as it is.
     """
 
+    # Not needed by the command line completion, which must start fast
+    import requests
+
     if session is None:
         return requests.Session()
     else:
@@ -70,3 +81,96 @@ class lazydict(defaultdict):
 
         self[key] = value
         return value
+
+
+def prefetched(iterable: Iterable[T], *, maxsize: int = 16, name: str = None) -> Iterator[T]:
+    """Iterate over iterable in a separate thread.
+
+    The items are produced by a background thread while the previous ones
+    are being consumed, so the producer and the consumer can run in parallel
+    wherever they release the GIL (I/O, compression, SQLite, ...).
+    The producer is kept at most maxsize items ahead of the consumer.
+
+    Exceptions raised by the producer are re-raised in the consumer.
+    When the iteration is abandoned, the producer is stopped before
+    it produces next item.
+
+    Keyword arguments:
+        iterable: The source of the items. It is used only
+            from the background thread.
+        maxsize: Maximal number of produced, but not yet consumed items.
+        name: Name of the background thread.
+
+    Yields:
+        The items of the iterable, in order.
+    """
+
+    items = queue.Queue(maxsize)
+    cancelled = threading.Event()
+    end = object()  # Marker of end of the items
+
+    def offer(entry) -> bool:
+        """Put entry to the queue, unless the consumer gave up."""
+
+        while not cancelled.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not offer((item, None)):
+                    return
+        except BaseException as error:
+            offer((end, error))
+        else:
+            offer((end, None))
+
+    worker = threading.Thread(target=produce, name=name, daemon=True)
+    worker.start()
+
+    try:
+        while True:
+            item, error = items.get()
+            if item is end:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        cancelled.set()
+        worker.join()
+
+
+@contextmanager
+def file_lock(path: Path, *, blocking: bool = True) -> Iterator[bool]:
+    """Hold an exclusive advisory lock of a file.
+
+    The lock is shared by all processes, but not by threads of one process
+    using the same file object. The file is created if it does not exist,
+    and it is never removed.
+
+    Keyword arguments:
+        path: The lock file.
+        blocking: Wait for the lock, if it is held by someone else.
+
+    Yields:
+        True if the lock was acquired, False if not (only when not blocking).
+    """
+
+    with path.open(mode='a') as lockfile:
+        operation = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(lockfile.fileno(), operation)
+        except BlockingIOError:
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            fcntl.flock(lockfile.fileno(), fcntl.LOCK_UN)
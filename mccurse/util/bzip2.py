@@ -0,0 +1,228 @@
+"""Parallel decompression of bzip2 data.
+
+The bzip2 format compresses the data in independent blocks (up to 900 kB
+of input each). The blocks are not aligned to bytes; each one starts
+with a 48-bit magic number and contains its own CRC, and the stream ends
+with another magic number followed by a CRC combined from all the blocks.
+
+Each block can thus be cut out and wrapped into a stand-alone
+single-block stream -- its combined CRC is then equal to the block CRC --
+which can be decompressed independently of the others.
+"""
+
+import bz2
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator, List, Tuple
+
+#: Magic number starting each compressed block
+BLOCK_MAGIC = 0x314159265359
+#: Magic number marking the end of the stream
+END_MAGIC = 0x177245385090
+
+#: Width of the magic numbers, in bits
+_MAGIC_BITS = 48
+#: Width of the CRCs, in bits
+_CRC_BITS = 32
+#: Stream header with the largest block size, able to decompress any block
+_HEADER = b'BZh9'
+
+#: Bit range of a block in the compressed data
+Span = Tuple[int, int]
+
+
+def find_magic(data: bytes, magic: int) -> Iterator[int]:
+    """Find all occurrences of a magic number, at any bit offset.
+
+    Keyword arguments:
+        data: The data to search in.
+        magic: The 48-bit magic number to search for.
+
+    Yields:
+        The bit offsets of the magic number, in no particular order.
+    """
+
+    mask = (1 << _MAGIC_BITS) - 1
+
+    for shift in range(8):
+        # Magic shifted by `shift` bits spans 7 bytes; the inner 5 are whole
+        window = 7
+        pattern = (magic << (8 - shift)).to_bytes(window, 'big')[1:6]
+
+        found = data.find(pattern)
+        while found != -1:
+            start = found - 1
+            if start >= 0 and start + window <= len(data):
+                value = int.from_bytes(data[start:start + window], 'big')
+                if (value >> (8 - shift)) & mask == magic:
+                    yield start * 8 + shift
+            found = data.find(pattern, found + 1)
+
+
+def split_blocks(data: bytes) -> List[Span]:
+    """Find the compressed blocks in the (possibly multi-stream) data.
+
+    Keyword arguments:
+        data: The complete bzip2 data.
+
+    Returns:
+        The bit ranges of the blocks, in order.
+
+    Raises:
+        ValueError: The data are not in bzip2 format.
+    """
+
+    blocks = sorted(find_magic(data, BLOCK_MAGIC))
+    ends = sorted(find_magic(data, END_MAGIC))
+
+    spans = []
+    stream = 0  # Byte offset of current stream
+    while stream < len(data):
+        if data[stream:stream + 3] != b'BZh':
+            raise ValueError('Invalid bzip2 stream header at {}'.format(stream))
+
+        first = (stream + 4) * 8
+        end = next((e for e in ends if e >= first), None)
+        if end is None:
+            raise ValueError('Missing end of bzip2 stream at {}'.format(stream))
+
+        starts = [b for b in blocks if first <= b < end]
+        spans.extend(zip(starts, starts[1:] + [end]))
+
+        # The stream is padded to whole bytes after the combined CRC
+        stream = -(-(end + _MAGIC_BITS + _CRC_BITS) // 8)
+
+    return spans
+
+
+def _bits(data: bytes, span: Span) -> int:
+    """Read a range of bits as an unsigned integer."""
+
+    start, end = span
+    value = int.from_bytes(data[start // 8:-(-end // 8)], 'big')
+    return (value >> (-end % 8)) & ((1 << (end - start)) - 1)
+
+
+def decompress_block(data: bytes, span: Span) -> bytes:
+    """Decompress a single block.
+
+    Keyword arguments:
+        data: The compressed data containing the block.
+        span: The bit range of the block in the data.
+
+    Returns:
+        The decompressed contents of the block.
+
+    Raises:
+        OSError, ValueError: The block is not valid.
+    """
+
+    start, end = span
+    size = end - start
+    block = _bits(data, span)
+
+    crc = (block >> (size - _MAGIC_BITS - _CRC_BITS)) & ((1 << _CRC_BITS) - 1)
+
+    stream = (((block << _MAGIC_BITS) | END_MAGIC) << _CRC_BITS) | crc
+    size += _MAGIC_BITS + _CRC_BITS
+    padding = -size % 8
+
+    stream = (stream << padding).to_bytes((size + padding) // 8, 'big')
+    return bz2.decompress(_HEADER + stream)
+
+
+def _decompress_slice(data: bytes, span: Span) -> bytes:
+    """Decompress a block from the smallest slice containing it.
+
+    Only the slice is passed to the worker process.
+    """
+
+    start, end = span
+    offset = start // 8 * 8
+    return decompress_block(data, (start - offset, end - offset))
+
+
+def _worker_pool(workers: int) -> Executor:
+    """Create pool of workers for the decompression.
+
+    The decompression usually runs in a thread, alongside others, and
+    forking a multi-threaded process may deadlock the children. The worker
+    processes are thus started fresh, by a fork server where available.
+    Older Pythons cannot choose the start method of the pool, so threads
+    are used there instead -- bz2 releases the GIL while decompressing.
+    """
+
+    if sys.version_info < (3, 7):
+        return ThreadPoolExecutor(max_workers=workers)
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def decompress(data: bytes, *, workers: int = None) -> Iterator[bytes]:
+    """Decompress the data by blocks, in parallel.
+
+    Only a few blocks more than the number of the workers are decompressed
+    ahead of the consumer, to keep the memory usage bounded.
+
+    A block wrongly split in two by an accidental magic number in its data
+    fails to decompress; such blocks are merged back together.
+
+    Keyword arguments:
+        data: The complete bzip2 data.
+        workers: The number of worker processes; the number of CPUs
+            by default.
+
+    Yields:
+        The decompressed data, in order.
+
+    Raises:
+        ValueError: The data are not in bzip2 format.
+        OSError: The data are corrupted.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    spans = deque(split_blocks(data))
+    pending = deque()  # Pairs of span and its decompression result
+
+    def piece(span: Span) -> bytes:
+        return data[span[0] // 8:-(-span[1] // 8)]
+
+    def cancel_pending() -> None:
+        for _, result in pending:
+            result.cancel()
+        pending.clear()
+
+    with _worker_pool(workers) as pool:
+        try:
+            while spans or pending:
+                while spans and len(pending) < 2 * workers:
+                    span = spans.popleft()
+                    pending.append((span, pool.submit(_decompress_slice, piece(span), span)))
+
+                span, result = pending.popleft()
+                try:
+                    contents = result.result()
+                except (OSError, ValueError):
+                    # Merge with the following blocks of the same stream
+                    # (already submitted ones first) until it decompresses
+                    spans.extendleft(reversed([s for s, _ in pending]))
+                    cancel_pending()
+                    contents = None
+
+                while contents is None:
+                    if not spans or spans[0][0] != span[1]:
+                        raise OSError('Invalid bzip2 block at bit {}'.format(span[0]))
+                    span = (span[0], spans.popleft()[1])
+                    try:
+                        contents = decompress_block(data, span)
+                    except (OSError, ValueError):
+                        continue
+
+                yield contents
+        finally:
+            cancel_pending()
@@ -0,0 +1,148 @@
+"""Bounded cache of computed values, with optional persistence."""
+
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class LRUCache:
+    """Cache of limited size, discarding the least recently used entries.
+
+    The number of lookups answered from the cache and of those which
+    had to compute the value is counted in :attr:`hits` and :attr:`misses`,
+    respectively. Changes of the entries since the last :meth:`dump`
+    are flagged by :attr:`modified`.
+    """
+
+    __slots__ = 'capacity', 'hits', 'misses', 'modified', '_entries'
+
+    def __init__(self, capacity: int = 256):
+        """Create empty cache.
+
+        Keyword arguments:
+            capacity: Maximal number of stored entries.
+        """
+
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.modified = False
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __setitem__(self, key: Hashable, value) -> None:
+        self.put(key, value)
+
+    def lookup(self, key: Hashable, default=None):
+        """Provide the value for a key, without computing missing ones.
+
+        Keyword arguments:
+            key: The key of the value.
+            default: The value to provide when the key is not stored.
+
+        Returns:
+            The value for the key, or the default.
+        """
+
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value) -> None:
+        """Store the value for a key, as the most recently used entry.
+
+        Storing does not change the counters.
+
+        Keyword arguments:
+            key: The key of the value.
+            value: The value to store.
+        """
+
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        self.modified = True
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def get(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Provide the value for a key, computing it if not stored.
+
+        Keyword arguments:
+            key: The key of the value.
+            compute: Function computing the value, when it is not stored.
+                Nothing is stored if it raises an exception.
+
+        Returns:
+            The value for the key.
+        """
+
+        missing = object()
+        value = self.lookup(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+
+        return value
+
+    def clear(self) -> None:
+        """Remove all stored entries; the counters are kept."""
+
+        self._entries.clear()
+        self.modified = True
+
+    def load(self, path: Path) -> None:
+        """Add the entries stored in a file, as the least recently used ones.
+
+        Missing or unreadable file is ignored -- the cache is only
+        an optimization.
+
+        Keyword arguments:
+            path: The file to read the entries from.
+        """
+
+        try:
+            with path.open(mode='rb') as stream:
+                stored = pickle.load(stream)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return
+
+        current = list(self._entries.items())
+        self._entries.clear()
+        self._entries.update(stored[-self.capacity:])
+        for key, value in current:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def dump(self, path: Path) -> None:
+        """Store the entries to a file.
+
+        The file is replaced atomically, so concurrent readers never see
+        it incomplete.
+
+        Keyword arguments:
+            path: The file to write the entries to.
+        """
+
+        temporary = path.with_name('.{}.{}'.format(path.name, os.getpid()))
+        with temporary.open(mode='wb') as stream:
+            pickle.dump(list(self._entries.items()), stream, pickle.HIGHEST_PROTOCOL)
+        temporary.replace(path)
+        self.modified = False
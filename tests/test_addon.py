@@ -4,10 +4,12 @@ from datetime import datetime, timezone
 
 import pytest
 import responses
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm.session import Session as SQLSession
 
 from mccurse import addon, curse
 from mccurse.util import yaml
+from mccurse.util.cache import LRUCache
 
 
 # Fixtures
@@ -68,6 +70,150 @@ def test_mod_search(filled_database):
     assert {int(m.id) for m in selected} == EXPECT_IDS
 
 
+def test_mod_lookup_cache(filled_database, monkeypatch):
+    """Are the searches cached until the data version changes?"""
+
+    monkeypatch.setattr(addon, 'lookup_cache', LRUCache())
+    session = SQLSession(bind=filled_database.engine)
+
+    assert [m.id for m in addon.Mod.search(session, 'Test')] == [42, 45]
+    assert [m.id for m in addon.Mod.search(session, 'test')] == [42, 45]
+    assert (addon.lookup_cache.hits, addon.lookup_cache.misses) == (1, 1)
+
+    assert [m.id for m in addon.Mod.iter_search(session, 'test')] == [42, 45]
+    assert [m.id for m in addon.Mod.iter_search(session, 'test')] == [42, 45]
+    assert addon.lookup_cache.hits == 2
+
+    # Exact lookups go straight to the database
+    assert addon.Mod.find(session, 'tested').id == 42
+    assert addon.Mod.find_many(session, ['Tested'])['Tested'].id == 42
+    assert (addon.lookup_cache.hits, addon.lookup_cache.misses) == (2, 2)
+
+    # New data version -- new lookups
+    filled_database.version = datetime(2017, 1, 1, tzinfo=timezone.utc)
+    assert [m.id for m in addon.Mod.search(session, 'test')] == [42, 45]
+    assert addon.lookup_cache.hits == 2
+
+
+def test_mod_suggest_cache(filled_database, monkeypatch):
+    """Are the suggestions cached?"""
+
+    monkeypatch.setattr(addon, 'lookup_cache', LRUCache())
+    session = SQLSession(bind=filled_database.engine)
+
+    first = [m.id for m in addon.Mod.suggest(session, 'tsted')]
+    assert [m.id for m in addon.Mod.suggest(session, 'tsted')] == first
+    assert (addon.lookup_cache.hits, addon.lookup_cache.misses) == (1, 1)
+
+
+def test_mod_search_ranking(filled_database):
+    """Are the search results ranked, matching words by prefix?"""
+
+    session = SQLSession(bind=filled_database.engine)
+
+    assert addon.Mod.has_search_index(filled_database.engine)
+    # Name match first
+    assert [m.id for m in addon.Mod.search(session, 'test')] == [42, 45]
+    # All words must match
+    assert [m.id for m in addon.Mod.search(session, 'valid tes')] == [45]
+    assert addon.Mod.search(session, 'tested dummy') == []
+
+    # The index follows the changes
+    mod = addon.Mod.with_id(session, 3)
+    mod.name = 'tests'
+    session.commit()
+
+    assert [m.id for m in addon.Mod.search(session, 'tests')] == [3]
+
+
+def test_mod_search_fallback(filled_database):
+    """Does the search work without the index?"""
+
+    addon.Mod.drop_search_index(filled_database.engine)
+    session = SQLSession(bind=filled_database.engine)
+
+    assert not addon.Mod.has_search_index(filled_database.engine)
+    assert [m.id for m in addon.Mod.search(session, 'ested')] == [42, 45]
+
+
+@pytest.mark.parametrize('indexed', [True, False])
+def test_mod_search_range(filled_database, indexed, monkeypatch):
+    """Are the search results paginated and streamed correctly?"""
+
+    if not indexed:
+        addon.Mod.drop_search_index(filled_database.engine)
+    session = SQLSession(bind=filled_database.engine)
+
+    assert [m.id for m in addon.Mod.search(session, 'test', limit=1)] == [42]
+    assert [m.id for m in addon.Mod.search(session, 'test', offset=1)] == [45]
+    assert addon.Mod.search(session, 'test', limit=1, offset=2) == []
+
+    results = addon.Mod.iter_search(session, 'test')
+    assert not isinstance(results, list)
+    assert [m.id for m in results] == [42, 45]
+    assert [m.id for m in addon.Mod.iter_search(session, 'test', offset=1)] == [45]
+
+    # Results past the first batch
+    monkeypatch.setattr(addon.Mod, '_SEARCH_BATCH', 1)
+    assert [m.id for m in addon.Mod.iter_search(session, 'test')] == [42, 45]
+    assert [m.id for m in addon.Mod.iter_search(session, 'test', limit=1)] == [42]
+    assert [m.id for m in addon.Mod.iter_search(session, '', limit=2)] == [42, 45]
+
+
+@pytest.mark.parametrize('indexed', [True, False])
+def test_mod_search_order(filled_database, indexed):
+    """Are the search results sorted by popularity and filtered by category?"""
+
+    if not indexed:
+        addon.Mod.drop_search_index(filled_database.engine)
+    engine = filled_database.engine
+    update = addon.Mod.__table__.update().where(addon.Mod.id == bindparam('mod'))
+    engine.execute(update, [
+        {'mod': 42, 'downloads': 10, 'popularity': 1.5},
+        {'mod': 45, 'downloads': 5, 'popularity': 7.0},
+        {'mod': 3, 'downloads': 20, 'popularity': 3.0},
+    ])
+    addon.Mod.store_categories(engine, {42: [(1, 'Magic')], 45: [(1, 'Magic'), (2, 'Tech')]})
+
+    session = SQLSession(bind=engine)
+
+    def ids(mods):
+        return [m.id for m in mods]
+
+    assert ids(addon.Mod.search(session, 'test', sort='popularity')) == [45, 42]
+    assert ids(addon.Mod.search(session, '', sort='downloads')) == [3, 42, 45]
+    assert ids(addon.Mod.iter_search(session, '', sort='popularity', limit=2)) == [45, 3]
+
+    magic = addon.Mod.find_category(session, 'MAGIC')
+    assert ids(addon.Mod.search(session, 'test', category=magic)) == [42, 45]
+    assert ids(addon.Mod.search(session, '', sort='name', category=2)) == [45]
+
+    with pytest.raises(addon.NoResultFound):
+        addon.Mod.find_category(session, 'nonsense')
+    with pytest.raises(ValueError):
+        addon.Mod.search(session, 'test', sort='nonsense')
+
+
+def test_mod_store_categories(filled_database):
+    """Are only the changes of the categories written?"""
+
+    engine = filled_database.engine
+    links = addon.mod_category_table
+
+    def stored():
+        query = select([links.c.mod_id, links.c.category_id])
+        return sorted(tuple(r) for r in engine.execute(query))
+
+    assert addon.Mod.store_categories(engine, {42: [(1, 'Magic')], 45: [(2, 'Tech')]}) == (2, 0)
+    changed = {42: [(1, 'Magic'), (2, 'Tech')]}
+    assert addon.Mod.store_categories(engine, changed, complete=False) == (1, 0)
+    assert stored() == [(42, 1), (42, 2), (45, 2)]
+
+    assert addon.Mod.store_categories(engine, {42: [(2, 'Tech')]}) == (0, 2)
+    assert stored() == [(42, 2)]
+    assert [tuple(r) for r in engine.execute(select([addon.category_table]))] == [(2, 'Tech')]
+
+
 def test_mod_find(filled_database):
     """Does the search find the correct mod or report correct error?"""
 
@@ -79,6 +225,21 @@ def test_mod_find(filled_database):
         addon.Mod.find(session, 'nonsense')
 
 
+def test_mod_suggest(filled_database):
+    """Are similar names suggested for misspelled ones?"""
+
+    session = SQLSession(bind=filled_database.engine)
+
+    assert addon.Mod.has_search_index(filled_database.engine, 'mods_trigrams')
+    assert [m.id for m in addon.Mod.suggest(session, 'Testd')] == [42, 45]
+    assert [m.id for m in addon.Mod.suggest(session, 'unrelatted', limit=1)] == [3]
+    assert addon.Mod.suggest(session, 'nonsense') == []
+
+    # Without the index
+    addon.Mod.drop_search_index(filled_database.engine)
+    assert [m.id for m in addon.Mod.suggest(session, 'unrelatted')] == [3]
+
+
 def test_mod_with_id(filled_database):
     """Does the with_id find the correct mod?"""
 
@@ -91,6 +252,46 @@ def test_mod_with_id(filled_database):
         addon.Mod.with_id(session, 44)
 
 
+def test_mod_with_ids(filled_database):
+    """Are several mods fetched at once?"""
+
+    session = SQLSession(bind=filled_database.engine)
+
+    found = addon.Mod.with_ids(session, [42, 45, 44])
+
+    assert {i: m.name for i, m in found.items()} == {42: 'tested', 45: 'tester'}
+    assert addon.Mod.with_ids(session, []) == {}
+
+
+def test_mod_find_many(filled_database):
+    """Are several mods found by name at once?"""
+
+    session = SQLSession(bind=filled_database.engine)
+
+    found = addon.Mod.find_many(session, ['Tested', 'unrelated', 'nonsense'])
+
+    assert {n: m.id for n, m in found.items()} == {'Tested': 42, 'unrelated': 3}
+    assert addon.Mod.find_many(session, []) == {}
+
+    # Patterns
+    found = addon.Mod.find_many(session, ['unrel%', 'x%', 'tested'])
+    assert {n: m.id for n, m in found.items()} == {'unrel%': 3, 'tested': 42}
+    with pytest.raises(addon.MultipleResultsFound):
+        addon.Mod.find_many(session, ['TESTE_'])
+
+
+def test_mod_complete(filled_database):
+    """Are the names completed by their prefix, ignoring case?"""
+
+    session = SQLSession(bind=filled_database.engine)
+
+    assert addon.Mod.complete(session, 'TEST') == ['tested', 'tester']
+    assert addon.Mod.complete(session, 'teste', limit=1) == ['tested']
+    assert addon.Mod.complete(session, 'u') == ['unrelated']
+    assert addon.Mod.complete(session, 'x') == []
+    assert len(addon.Mod.complete(session, '')) == 3
+
+
 # Release tests
 
 def test_release():
@@ -0,0 +1,135 @@
+"""Tests for the catalogue submodule."""
+
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from mccurse import catalogue
+
+
+# Fixtures
+
+@pytest.fixture
+def version() -> datetime:
+    """Version of the catalogued data."""
+
+    return datetime(2017, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def mods_catalogue(tmpdir, version) -> catalogue.Catalogue:
+    """Catalogue with some mods."""
+
+    path = Path(str(tmpdir)) / 'test.catalogue'
+    mods = [
+        (45, 'tester', 'Validate tested mod'),
+        (42, 'Tested', 'Mod under test'),
+        (3, 'unrelated', 'Dummy'),
+        (7, 'Straße', 'Multi-line\nsummary'),
+    ]
+
+    assert catalogue.build(path, mods, version=version) == 4
+
+    with catalogue.Catalogue(path) as opened:
+        yield opened
+
+
+# Catalogue tests
+
+def test_catalogue_contents(mods_catalogue, version):
+    """Are all the mods stored, in order of their ids?"""
+
+    assert mods_catalogue.version == version
+    assert len(mods_catalogue) == 4
+    assert [e.id for e in mods_catalogue] == [3, 7, 42, 45]
+
+
+def test_catalogue_with_id(mods_catalogue):
+    """Are the mods found by their ids?"""
+
+    assert mods_catalogue.with_id(42) == (42, 'Tested', 'Mod under test')
+    assert mods_catalogue.with_id(3).name == 'unrelated'
+    assert mods_catalogue.with_id(45).name == 'tester'
+
+    for missing in (1, 44, 46):
+        with pytest.raises(KeyError):
+            mods_catalogue.with_id(missing)
+
+
+def test_catalogue_find(mods_catalogue):
+    """Are the mods found by their names, ignoring case?"""
+
+    assert mods_catalogue.find('tested').id == 42
+    assert mods_catalogue.find('STRASSE').id == 7
+
+    with pytest.raises(KeyError):
+        mods_catalogue.find('test')
+
+
+def test_catalogue_complete(mods_catalogue):
+    """Are the names completed by their prefix?"""
+
+    assert [e.id for e in mods_catalogue.complete('TEST')] == [42, 45]
+    assert [e.id for e in mods_catalogue.complete('test', limit=1)] == [42]
+    assert [e.id for e in mods_catalogue.complete('')] == [7, 42, 45, 3]
+    assert mods_catalogue.complete('x') == []
+
+
+def test_catalogue_search(mods_catalogue):
+    """Are the mods found by their names and summaries?"""
+
+    # Name matches first
+    assert [e.id for e in mods_catalogue.search('test')] == [42, 45]
+    assert [e.id for e in mods_catalogue.search('mod')] == [42, 45]
+    assert [e.id for e in mods_catalogue.search('line summary')] == [7]
+    assert mods_catalogue.search('test', limit=1)[0].id == 42
+    assert mods_catalogue.search('nonsense') == []
+
+
+def test_catalogue_empty(tmpdir, version):
+    """Do the lookups work without any mods?"""
+
+    path = Path(str(tmpdir)) / 'empty.catalogue'
+    assert catalogue.build(path, [], version=version) == 0
+
+    with catalogue.Catalogue(path) as empty:
+        assert len(empty) == 0
+        assert empty.complete('test') == []
+        assert empty.search('test') == []
+        assert empty.search('') == []
+        with pytest.raises(KeyError):
+            empty.find('test')
+
+
+def test_catalogue_invalid(tmpdir):
+    """Are invalid files rejected?"""
+
+    path = Path(str(tmpdir)) / 'invalid.catalogue'
+
+    for contents in (b'', b'garbage', b'garbage' * 100):
+        path.write_bytes(contents)
+        with pytest.raises(catalogue.InvalidCatalogueError):
+            catalogue.Catalogue(path)
+
+
+def test_catalogue_open_current(tmpdir, version):
+    """Is the catalogue opened only when it matches its database?"""
+
+    database = Path(str(tmpdir)) / 'test.sqlite'
+    assert catalogue.open_current(database) is None
+
+    catalogue.build(catalogue.path_of(database), [(1, 'Tested', '')], version=version)
+    assert catalogue.open_current(database) is None
+
+    for stored, current in ((version, True), (version + timedelta(hours=1), False)):
+        with closing(sqlite3.connect(str(database))) as conn:
+            conn.execute('PRAGMA user_version = {:d}'.format(int(stored.timestamp())))
+
+        opened = catalogue.open_current(database)
+        assert (opened is not None) == current
+        if opened is not None:
+            with opened:
+                assert opened.find('tested').id == 1
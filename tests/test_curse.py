@@ -3,7 +3,11 @@
 
 import bz2
 import datetime
+import io
 import json
+import sqlite3
+import threading
+import time
 from functools import partial
 from pathlib import Path
 
@@ -12,6 +16,7 @@ import ijson
 import pytest
 import requests
 import responses
+import sqlalchemy
 from pyfakefs import fake_filesystem, fake_pathlib
 
 from mccurse import curse
@@ -84,6 +89,20 @@ def test_complete_timestamp_url(minecraft_feed):
     assert len(responses.calls) == 0
 
 
+@responses.activate
+def test_hourly_feed_urls(minecraft_feed):
+    """Generate correct hourly feed and timestamp URLs?"""
+
+    EXPECT = '/'.join((
+        curse.Feed._BASEURL.format(id=minecraft_feed.game_id),
+        curse.Feed._HOURLY_URL,
+    ))
+
+    assert minecraft_feed.hourly_url == EXPECT
+    assert minecraft_feed.hourly_timestamp_url == EXPECT + '.txt'
+    assert len(responses.calls) == 0
+
+
 @responses.activate
 def test_content_decoding(minecraft_feed):
     """Decode the stream contents correctly?"""
@@ -92,7 +111,40 @@ def test_content_decoding(minecraft_feed):
     INPUT = bz2.compress(EXPECT.encode('utf-8'))
 
     with minecraft_feed._decode_contents(INPUT) as stream:
-        decoded = stream.read()
+        decoded = stream.read().decode('utf-8')
+
+    assert decoded == EXPECT
+    assert len(responses.calls) == 0
+
+
+@responses.activate
+def test_chunked_content_decoding(minecraft_feed):
+    """Decode the contents correctly when provided in small pieces?"""
+
+    PARTS = 'Ahoj světe', ', znovu!'
+    EXPECT = ''.join(PARTS)
+    # Concatenated streams, split to tiny chunks
+    compressed = b''.join(bz2.compress(p.encode('utf-8')) for p in PARTS)
+    INPUT = (compressed[i:i+7] for i in range(0, len(compressed), 7))
+
+    with minecraft_feed._decode_contents(INPUT) as stream:
+        decoded = stream.read().decode('utf-8')
+
+    assert decoded == EXPECT
+    assert len(responses.calls) == 0
+
+
+@responses.activate
+def test_pipelined_content_decoding(minecraft_feed):
+    """Decode the contents correctly in a separate thread?"""
+
+    EXPECT = 'Ahoj světe, ' * 10000
+    compressed = bz2.compress(EXPECT.encode('utf-8'))
+    INPUT = (compressed[i:i+1024] for i in range(0, len(compressed), 1024))
+
+    minecraft_feed.pipelined = True
+    with minecraft_feed._decode_contents(INPUT) as stream:
+        decoded = stream.read().decode('utf-8')
 
     assert decoded == EXPECT
     assert len(responses.calls) == 0
@@ -131,6 +183,164 @@ def test_fetch_complete(minecraft_feed):
         assert isinstance(timestamp, int)
 
 
+@pytest.fixture
+def cached_feed(tmpdir) -> curse.Feed:
+    """Feed keeping local copies in temporary directory."""
+
+    return curse.Feed(game_id=432, session=requests.Session(), cache_dir=Path(str(tmpdir)))
+
+
+@responses.activate
+def test_cached_feed_reuse(cached_feed):
+    """Is the local copy of the feed used when still current?"""
+
+    EXPECT = '{"data": []}'
+    url = cached_feed.complete_url
+
+    responses.add(
+        responses.GET, url,
+        body=bz2.compress(EXPECT.encode('utf-8')),
+        headers={'ETag': '"v1"'},
+    )
+    responses.add(responses.GET, url, status=304)
+
+    with cached_feed.fetch_complete() as feed:
+        assert feed.read().decode('utf-8') == EXPECT
+    with cached_feed.fetch_complete() as feed:
+        assert feed.read().decode('utf-8') == EXPECT
+    with cached_feed.fetch_complete(offline=True) as feed:
+        assert feed.read().decode('utf-8') == EXPECT
+
+    assert len(responses.calls) == 2
+    assert responses.calls[1].request.headers['If-None-Match'] == '"v1"'
+
+
+@responses.activate
+def test_cached_feed_resume(cached_feed):
+    """Is the interrupted download resumed?"""
+
+    EXPECT = 'Ahoj světe, ' * 100
+    compressed = bz2.compress(EXPECT.encode('utf-8'))
+    half = len(compressed) // 2
+
+    target, incomplete = cached_feed._cache_paths(cached_feed.complete_url)
+    incomplete.write_bytes(compressed[:half])
+    incomplete.with_name(incomplete.name + '.yaml').write_text(
+        yaml.dump({'etag': '"v1"', 'last_modified': None}), encoding='utf-8',
+    )
+
+    responses.add(
+        responses.GET, cached_feed.complete_url,
+        body=compressed[half:], status=206,
+    )
+
+    with cached_feed.fetch_complete() as feed:
+        assert feed.read().decode('utf-8') == EXPECT
+
+    request = responses.calls[0].request
+    assert request.headers['Range'] == 'bytes={}-'.format(half)
+    assert request.headers['If-Range'] == '"v1"'
+    assert target.read_bytes() == compressed
+    assert not incomplete.exists()
+
+
+@pytest.mark.parametrize('pipelined', [False, True])
+@responses.activate
+def test_cached_feed_parallel(cached_feed, pipelined, monkeypatch):
+    """Is the local copy decompressed correctly in parallel?"""
+
+    EXPECT = ''.join('{}: Ahoj světe. '.format(i) for i in range(30000))
+
+    responses.add(
+        responses.GET, cached_feed.complete_url,
+        body=bz2.compress(EXPECT.encode('utf-8'), 1),
+    )
+
+    responses.add(responses.GET, cached_feed.complete_url, status=304)
+
+    cached_feed.workers = 2
+    cached_feed.pipelined = pipelined
+    decoded = []
+    decode_file = curse.Feed._decode_file
+
+    def recorded(self, path):
+        decoded.append(path)
+        return decode_file(self, path)
+
+    monkeypatch.setattr(curse.Feed, '_decode_file', recorded)
+
+    # Downloaded feed is decompressed as it arrives
+    with cached_feed.fetch_complete() as feed:
+        assert feed.read().decode('utf-8') == EXPECT
+    assert decoded == []
+
+    # Current local copy is split to blocks, without reading it beforehand
+    def unread(self, path):
+        raise AssertionError('Local copy read by chunks')
+        yield
+
+    monkeypatch.setattr(curse.Feed, '_read_chunks', unread)
+    with cached_feed.fetch_complete() as feed:
+        assert feed.read().decode('utf-8') == EXPECT
+    assert len(decoded) == 1
+
+
+def test_cached_feed_offline(cached_feed):
+    """Is missing local copy reported when offline?"""
+
+    with pytest.raises(FileNotFoundError), cached_feed.fetch_complete(offline=True):
+        pass
+
+
+@pytest.mark.parametrize('parser', curse.STREAMING_PARSERS + (curse.DOCUMENT_PARSER, None))
+def test_feed_contents(parser):
+    """Are the mods and the timestamp read in a single pass?"""
+
+    if parser in curse.STREAMING_PARSERS:
+        try:
+            curse.streaming_parser(parser)
+        except ImportError:
+            pytest.skip('Parser {} not available'.format(parser))
+
+    EXPECT = datetime.datetime(2017, 1, 15, tzinfo=datetime.timezone.utc)
+
+    mod_path = {'CategorySection': {'Path': 'mods'}}
+    other_path = {'CategorySection': {'Path': 'other'}}
+    files = {'LatestFiles': [{'Id': 1, 'Name': 'file.jar', 'Summary': None}]}
+    categories = [{'CategoryId': 5, 'Name': 'Magic', 'Url': None}]
+    # Timestamp after the data
+    INPUT = json.dumps({
+        'data': [
+            dict(mod_path, Name='test', Id=42, Summary='Test mod', **files),
+            dict(
+                mod_path, Name='popular', Id=7, Summary='Often used',
+                DownloadCount=1000.0, PopularityScore=12.5, Categories=categories,
+            ),
+            dict(other_path, Name='map', Id=16, Summary='Map pack', Categories=categories),
+        ],
+        'timestamp': int(EXPECT.timestamp()*1000),
+    })
+
+    contents = curse.FeedContents(io.BytesIO(INPUT.encode('utf-8')), parser=parser)
+    mods = list(contents.mods())
+
+    assert mods[0] == {'Id': 42, 'Name': 'test', 'Summary': 'Test mod'}
+    assert len(mods) == 2
+    assert mods[1]['DownloadCount'] == 1000 and mods[1]['PopularityScore'] == 12.5
+    assert curse.Mod.categories_from_json(mods[1]) == ((5, 'Magic'),)
+    assert contents.signature() == EXPECT
+
+    with pytest.raises(curse.InvalidFeedError):
+        curse.FeedContents(io.BytesIO(b'{"data": []}'), parser=parser).signature()
+
+
+def test_unknown_parser():
+    """Is unknown parser reported?"""
+
+    with pytest.raises(ValueError):
+        curse.streaming_parser('nonsense')
+
+
 # Database tests
 
 def test_file_uri(file_database):
@@ -170,24 +380,231 @@ def test_database_versioning(file_database):
     assert file_database.version == INPUT
 
 
+def test_database_bulk_load(file_database):
+    """Are the rows loaded and the indexes preserved?"""
+
+    table = curse.Mod.__table__
+    table.create(file_database.engine)
+
+    file_database.engine.execute(table.insert(), id=1, name='old', summary='')
+    rows = ({'id': i, 'name': str(i), 'summary': ''} for i in range(10, 20))
+
+    count = file_database.bulk_load(table, rows, replace=True)
+    stored = {r.id for r in file_database.engine.execute(table.select())}
+    indexes = sqlalchemy.inspect(file_database.engine).get_indexes(table.name)
+
+    assert count == 10
+    assert stored == set(range(10, 20))
+    assert {i['name'] for i in indexes} == {i.name for i in table.indexes}
+
+
+def test_database_synchronize(file_database):
+    """Are only the changed rows written?"""
+
+    table = curse.Mod.__table__
+    table.create(file_database.engine)
+
+    def row(id, name, downloads=0):
+        values = {'id': id, 'name': name, 'summary': ''}
+        return dict(values, digest=curse.Mod.content_digest(values), downloads=downloads)
+
+    file_database.engine.execute(table.insert(), [
+        row(1, 'same'), row(2, 'changed'), row(3, 'removed'), row(5, 'counted'),
+    ])
+
+    contents = [row(1, 'same'), row(2, 'CHANGED'), row(4, 'new'), row(5, 'counted', 10)]
+    counters = ('downloads',)
+
+    assert file_database.synchronize(
+        table, contents, complete=False, counters=counters,
+    ) == (1, 1, 0)
+    assert file_database.synchronize(
+        table, contents, complete=True, counters=counters,
+    ) == (0, 0, 1)
+
+    stored = {r.id: (r.name, r.downloads) for r in file_database.engine.execute(table.select())}
+    assert stored == {1: ('same', 0), 2: ('CHANGED', 0), 4: ('new', 0), 5: ('counted', 10)}
+
+
+def test_database_replacement(file_database):
+    """Is the old data available until the replacement is complete?"""
+
+    table = curse.Mod.__table__
+
+    def stored(database):
+        return {r.id for r in database.engine.execute(table.select())}
+
+    table.create(file_database.engine)
+    file_database.engine.execute(table.insert(), id=1, name='old', summary='')
+
+    with file_database.replacement() as shadow:
+        table.create(shadow.engine)
+        shadow.engine.execute(table.insert(), id=2, name='new', summary='')
+
+        assert shadow.path != file_database.path
+        assert stored(file_database) == {1}
+
+    assert stored(file_database) == {2}
+    assert not shadow.path.exists()
+
+    with pytest.raises(RuntimeError), file_database.replacement() as shadow:
+        table.create(shadow.engine)
+        raise RuntimeError('Interrupted')
+
+    assert stored(file_database) == {2}
+    assert not shadow.path.exists()
+
+
+def test_database_connections(file_database):
+    """Are the connections shared and configured?"""
+
+    other = curse.Database(file_database.game_name, file_database.root_dir)
+
+    assert other.engine is file_database.engine
+    assert other.session() is file_database.session()
+
+    with file_database.engine.connect() as conn:
+        assert conn.execute('PRAGMA journal_mode').scalar() == 'wal'
+        assert conn.execute('PRAGMA temp_store').scalar() == 2  # MEMORY
+        assert conn.execute('PRAGMA mmap_size').scalar() > 0
+
+    file_database.close()
+    assert other.engine is file_database.engine
+
+
+def test_database_replacement_readers(file_database):
+    """Do the readers keep the old data while the database is replaced?"""
+
+    table = curse.Mod.__table__
+    table.create(file_database.engine)
+    file_database.engine.execute(table.insert(), id=1, name='old', summary='')
+
+    # Connections from other processes: idle, and in a read transaction
+    idle = sqlite3.connect(str(file_database.path))
+    reading = sqlite3.connect(str(file_database.path), isolation_level=None)
+    reading.execute('BEGIN')
+    assert reading.execute('SELECT id FROM mods').fetchall() == [(1,)]
+
+    with file_database.replacement() as shadow:
+        table.create(shadow.engine)
+        shadow.engine.execute(table.insert(), id=2, name='new', summary='')
+
+    assert {r.id for r in file_database.engine.execute(table.select())} == {2}
+    assert reading.execute('SELECT id FROM mods').fetchall() == [(1,)]
+    assert idle.execute('SELECT id FROM mods').fetchall() == [(2,)]
+
+    reading.execute('COMMIT')
+    assert reading.execute('SELECT id FROM mods').fetchall() == [(2,)]
+
+    idle.close()
+    reading.close()
+
+
+def test_database_replacement_search_index(file_database):
+    """Is the replaced search index usable?"""
+
+    table = curse.Mod.__table__
+    table.create(file_database.engine)
+    if not curse.Mod.has_search_index(file_database.engine):
+        pytest.skip('Full-text search not available')
+
+    file_database.engine.execute(table.insert(), id=1, name='old', summary='')
+
+    with file_database.replacement() as shadow:
+        table.create(shadow.engine)
+        shadow.engine.execute(table.insert(), id=2, name='new', summary='')
+
+    def matching(term):
+        query = 'SELECT rowid FROM mods_fts WHERE mods_fts MATCH ?'
+        return [r for r, in file_database.engine.execute(query, (term,))]
+
+    assert matching('old') == []
+    assert matching('new') == [2]
+
+    file_database.engine.execute(table.insert(), id=3, name='newer', summary='')
+    assert matching('newer') == [3]
+
+
+def test_database_write_during_read(file_database):
+    """Can the database be written while other process reads it?"""
+
+    table = curse.Mod.__table__
+    table.create(file_database.engine)
+    file_database.engine.execute(table.insert(), id=1, name='old', summary='')
+
+    reading = sqlite3.connect(str(file_database.path), isolation_level=None)
+    reading.execute('BEGIN')
+    assert reading.execute('SELECT id FROM mods').fetchall() == [(1,)]
+
+    file_database.engine.execute(table.insert(), id=2, name='new', summary='')
+
+    assert reading.execute('SELECT id FROM mods').fetchall() == [(1,)]
+    reading.close()
+
+
+def test_database_replacement_waits(file_database):
+    """Is the replacement delayed until other writers are done?"""
+
+    table = curse.Mod.__table__
+    table.create(file_database.engine)
+
+    # Write transaction from another process
+    writer = sqlite3.connect(str(file_database.path), isolation_level=None, check_same_thread=False)
+    writer.execute('BEGIN IMMEDIATE')
+    writer.execute("INSERT INTO mods (id, name, summary) VALUES (1, 'old', '')")
+    committing = threading.Timer(0.2, writer.execute, args=['COMMIT'])
+    committing.start()
+
+    with file_database.replacement() as shadow:
+        table.create(shadow.engine)
+        shadow.engine.execute(table.insert(), id=2, name='new', summary='')
+
+    committing.join()
+    writer.close()
+    assert {r.id for r in file_database.engine.execute(table.select())} == {2}
+
+
+def test_database_replacement_timeout(file_database, monkeypatch):
+    """Is the replacement discarded if the database cannot be locked?"""
+
+    monkeypatch.setattr(curse.Database, '_BUSY_TIMEOUT', 0.1)
+    curse.Mod.__table__.create(file_database.engine)
+
+    writer = sqlite3.connect(str(file_database.path), isolation_level=None)
+    writer.execute('BEGIN IMMEDIATE')
+
+    with pytest.raises(sqlite3.OperationalError):
+        with file_database.replacement() as shadow:
+            curse.Mod.__table__.create(shadow.engine)
+
+    assert not shadow.path.exists()
+    writer.close()
+
+
 # Game tests
 
+@pytest.mark.parametrize('pipelined', [False, True])
+@pytest.mark.parametrize('parser', [None, curse.DOCUMENT_PARSER])
 @responses.activate
-def test_gamedata_refresh(game):
+def test_gamedata_refresh(game, pipelined, parser):
     """Does the game refreshes its data correctly?"""
 
+    game.feed.pipelined = pipelined
+    game.feed.parser = parser
+
     now = datetime.datetime.now(tz=datetime.timezone.utc).replace(microsecond=0)  # noqa: E501
     curse_timestamp = int(now.timestamp()*1000)
 
     # Mock project feed
     mod_path = {'CategorySection': {'Path': 'mods'}}
     other_path = {'CategorySection': {'Path': 'other'}}
+    magic = {'Categories': [{'CategoryId': 5, 'Name': 'Magic'}]}
     mock_feed_body = {
         'timestamp': curse_timestamp,
         'data': [
-            dict(mod_path, Name='test', Id=42, Summary='Test mod'),
-            dict(mod_path, Name='nott', Id=15, Summary='No test!'),
-            dict(mod_path, Name='tinker', Id=432, Summary='Metamod'),
+            dict(mod_path, Name='test', Id=42, Summary='Test mod', PopularityScore=2.0, **magic),
+            dict(mod_path, Name='nott', Id=15, Summary='No test!', PopularityScore=9.0),
+            dict(mod_path, Name='tinker', Id=432, Summary='Metamod', PopularityScore=5.0, **magic),
 
             dict(other_path, Name='map', Id=16, Summary='Map pack'),
         ]
@@ -199,23 +616,194 @@ def test_gamedata_refresh(game):
         game.feed.complete_url,
         body=bz2.compress(json.dumps(mock_feed_body).encode('utf-8')),
     )
-    # Timestamp
-    responses.add(
-        responses.GET,
-        game.feed.complete_timestamp_url,
-        body=str(curse_timestamp).encode('utf-8'),
-    )
+    # No timestamp should be needed -- the database is empty
+    # and the feed contains its own
 
-    game.refresh_data()
+    assert game.refresh_data()
     sess = game.database.session()
 
-    assert len(responses.calls) == 2
+    assert len(responses.calls) == 1
     assert game.database.version == now
     assert sess.query(curse.Mod).count() == len([
         d for d in mock_feed_body['data']
         if d['CategorySection']['Path'] == 'mods'
     ])
 
+    # Re-import from the local copy
+    game.reimport_data()
+    sess = game.database.session()
+
+    assert len(responses.calls) == 1
+    assert game.database.version == now
+    assert sess.query(curse.Mod).count() == 3
+
+    # Popularity and categories
+    ranked = curse.Mod.search(sess, '', sort='popularity')
+    assert [m.id for m in ranked] == [15, 432, 42]
+    category = curse.Mod.find_category(sess, 'magic')
+    assert [m.id for m in curse.Mod.search(sess, '', category=category)] == [42, 432]
+
+    # Exported catalogue
+    with game.database.open_catalogue() as catalogue:
+        assert catalogue.version == now
+        assert catalogue.find('Tinker').id == 432
+
+    game.database.version = now + datetime.timedelta(hours=1)
+    assert game.database.open_catalogue() is None
+
+
+@responses.activate
+def test_gamedata_incremental_refresh(game):
+    """Does the game update only the changed add-ons from hourly feed?"""
+
+    complete = datetime.datetime(2017, 1, 15, tzinfo=datetime.timezone.utc)
+    hourly = complete + datetime.timedelta(hours=1)
+
+    mod_path = {'CategorySection': {'Path': 'mods'}}
+    sess = game.database.session()
+    sess.add_all([
+        curse.Mod(id=42, name='test', summary='Test mod'),
+        curse.Mod(id=15, name='nott', summary='No test!'),
+    ])
+    sess.commit()
+    game.database.version = complete
+
+    mock_feed_body = {
+        'timestamp': int(hourly.timestamp()*1000),
+        'data': [
+            dict(mod_path, Name='test', Id=42, Summary='Changed mod'),
+            dict(mod_path, Name='new', Id=7, Summary='New mod', Categories=[
+                {'CategoryId': 5, 'Name': 'Magic'},
+            ]),
+        ]
+    }
+
+    responses.add(
+        responses.GET,
+        game.feed.complete_timestamp_url,
+        body=str(int(complete.timestamp()*1000)).encode('utf-8'),
+    )
+    responses.add(
+        responses.GET,
+        game.feed.hourly_timestamp_url,
+        body=str(int(hourly.timestamp()*1000)).encode('utf-8'),
+    )
+    responses.add(
+        responses.GET,
+        game.feed.hourly_url,
+        body=bz2.compress(json.dumps(mock_feed_body).encode('utf-8')),
+    )
+
+    assert game.refresh_data()
+    sess = game.database.session()
+
+    assert len(responses.calls) == 3
+    assert game.database.version == hourly
+    assert sess.query(curse.Mod).count() == 3
+    assert sess.query(curse.Mod).get(42).summary == 'Changed mod'
+    assert sess.query(curse.Mod).get(15).summary == 'No test!'
+    assert [m.id for m in curse.Mod.search(sess, '', category=5)] == [7]
+
+
+@responses.activate
+def test_gamedata_conditional_refresh(game):
+    """Does the game skip the download when the feed did not change?"""
+
+    stored = datetime.datetime(2017, 1, 15, tzinfo=datetime.timezone.utc)
+    game.database.version = stored
+
+    # Same timestamp
+    responses.add(
+        responses.GET,
+        game.feed.hourly_timestamp_url,
+        body=str(int(stored.timestamp()*1000)).encode('utf-8'),
+        headers={'ETag': '"stamp"'},
+    )
+
+    assert not game.refresh_data()
+    assert len(responses.calls) == 1
+    assert game.database.get_meta('etag') == {'etag': None}
+
+    # Not modified according to validators
+    game.database.set_meta({'etag': '"stamp"'})
+    responses.reset()
+    responses.add(responses.GET, game.feed.hourly_timestamp_url, status=304)
+
+    assert not game.refresh_data()
+    assert len(responses.calls) == 1
+    assert responses.calls[0].request.headers['If-None-Match'] == '"stamp"'
+    assert game.database.version == stored
+
+
+@responses.activate
+def test_gamedata_refresh_lock(game):
+    """Is the refresh by another process waited for and reused?"""
+
+    refreshed = datetime.datetime(2017, 1, 15, tzinfo=datetime.timezone.utc)
+
+    with game.database.lock():
+        assert not game.refresh_data(wait=False)
+
+    locked = threading.Event()
+
+    def other_refresh():
+        with game.database.lock():
+            locked.set()
+            time.sleep(0.1)
+            game.database.version = refreshed
+
+    other = threading.Thread(target=other_refresh)
+    other.start()
+    locked.wait()
+
+    assert not game.refresh_data()
+    other.join()
+
+    assert len(responses.calls) == 0
+    assert game.database.version == refreshed
+
+
+@responses.activate
+def test_refresh_games(tmpdir):
+    """Are several games refreshed concurrently and independently?"""
+
+    now = datetime.datetime.now(tz=datetime.timezone.utc).replace(microsecond=0)  # noqa: E501
+
+    games = [
+        curse.Game(id=id, name=name, version='1.0', cache_dir=Path(str(tmpdir)))
+        for id, name in ((432, 'Minecraft'), (433, 'Other'))
+    ]
+
+    mod_path = {'CategorySection': {'Path': 'mods'}}
+    for game in games:
+        mock_feed_body = {
+            'timestamp': int(now.timestamp()*1000),
+            'data': [dict(mod_path, Name=game.name, Id=game.id, Summary='Mod')],
+        }
+        responses.add(
+            responses.GET,
+            game.feed.complete_url,
+            body=bz2.compress(json.dumps(mock_feed_body).encode('utf-8')),
+        )
+
+    assert curse.refresh_games(games) == {'Minecraft': True, 'Other': True}
+
+    for game in games:
+        assert game.database.path.exists()
+        assert game.database.session().query(curse.Mod).one().id == game.id
+
+    # One failing game does not prevent refresh of the others
+    other = curse.Game(id=434, name='Failing', version='1.0', cache_dir=Path(str(tmpdir)))
+    responses.add(responses.GET, other.feed.complete_url, status=404)
+    responses.add(
+        responses.GET,
+        games[0].feed.hourly_timestamp_url,
+        body=str(int(now.timestamp()*1000)).encode('utf-8'),
+    )
+
+    with pytest.raises(curse.HTTPError):
+        curse.refresh_games([games[0], other])
+
 
 @responses.activate
 def test_gamedata_fresh(game):
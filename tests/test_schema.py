@@ -0,0 +1,110 @@
+"""Tests for the schema submodule."""
+
+import sqlalchemy
+from sqlalchemy.orm.session import Session as SQLSession
+
+from mccurse import addon, schema
+
+
+def test_new_database(file_database):
+    """Is new database created with current schema and marked so?"""
+
+    engine = file_database.engine
+
+    assert schema.current_version(engine) is None
+    assert schema.upgrade(engine) == []
+
+    assert schema.current_version(engine) == schema.latest_version()
+    assert schema.is_current(engine)
+    assert addon.Mod.has_search_index(engine)
+
+
+def test_legacy_database(file_database):
+    """Is database without versioning migrated, keeping the data?"""
+
+    engine = file_database.engine
+    engine.execute('CREATE TABLE mods (id INTEGER PRIMARY KEY, name VARCHAR, summary VARCHAR)')
+    engine.execute("INSERT INTO mods VALUES (42, 'Tested', 'Mod under test')")
+
+    assert schema.current_version(engine) == 0
+
+    applied = schema.upgrade(engine)
+
+    assert [m.version for m in applied] == list(range(1, schema.latest_version() + 1))
+    assert schema.is_current(engine)
+    assert schema.upgrade(engine) == []
+
+    columns = {c['name'] for c in sqlalchemy.inspect(engine).get_columns('mods')}
+    assert set(addon.Mod.__table__.columns.keys()) <= columns
+
+    session = SQLSession(bind=engine)
+    assert [m.id for m in addon.Mod.search(session, 'test')] == [42]
+    assert addon.Mod.complete(session, 'tes') == ['Tested']
+
+
+def test_pending_migration(file_database, monkeypatch):
+    """Is only the new migration applied to a current database?"""
+
+    engine = file_database.engine
+    schema.upgrade(engine)
+
+    # Keep the new index out of the other tests
+    table = addon.Mod.__table__
+    monkeypatch.setattr(table, 'indexes', set(table.indexes))
+    index = sqlalchemy.Index('ix_mods_summary_name', addon.Mod.summary, addon.Mod.name)
+    applied = []
+
+    def new_index(connection):
+        applied.append(schema.add_index(connection, index))
+
+    migrations = schema.MIGRATIONS + [
+        schema.Migration(schema.latest_version() + 1, 'Test index', new_index),
+    ]
+    monkeypatch.setattr(schema, 'MIGRATIONS', migrations)
+
+    assert not schema.is_current(engine)
+    assert [m.description for m in file_database.upgrade_schema()] == ['Test index']
+    assert applied == [True]
+
+    indexes = sqlalchemy.inspect(engine).get_indexes('mods')
+    assert index.name in {i['name'] for i in indexes}
+    assert file_database.upgrade_schema() == []
+
+
+def test_legacy_name_keys(file_database):
+    """Are the case-folded names added to the stored mods?"""
+
+    engine = file_database.engine
+    engine.execute('CREATE TABLE mods (id INTEGER PRIMARY KEY, name VARCHAR, summary VARCHAR)')
+    engine.execute("INSERT INTO mods VALUES (1, 'Straße', '')")
+
+    schema.upgrade(engine)
+
+    session = SQLSession(bind=engine)
+    assert addon.Mod.complete(session, 'STRASSE') == ['Straße']
+    assert addon.Mod.find_many(session, ['strasse'])['strasse'].id == 1
+
+
+def test_unavailable_search_index(file_database, monkeypatch):
+    """Are the search indexes retried only with another SQLite library?"""
+
+    engine = file_database.engine
+    with monkeypatch.context() as patch:
+        patch.setattr(addon.Mod, 'ensure_search_index', classmethod(lambda cls, conn: False))
+        assert schema.upgrade(engine) == []
+
+    assert schema.current_version(engine) == schema.latest_version()
+    assert schema.is_current(engine)
+    assert file_database.get_meta(schema.SEARCH_UNAVAILABLE) == {
+        schema.SEARCH_UNAVAILABLE: schema.sqlite3.sqlite_version,
+    }
+
+    monkeypatch.setattr(schema.sqlite3, 'sqlite_version', '0.0.0')
+    assert not schema.is_current(engine)
+
+    assert file_database.upgrade_schema() == []
+    assert schema.is_current(engine)
+    assert addon.Mod.has_search_index(engine)
+    assert file_database.get_meta(schema.SEARCH_UNAVAILABLE) == {
+        schema.SEARCH_UNAVAILABLE: None,
+    }
@@ -0,0 +1,47 @@
+"""Tests for tui submodule."""
+
+from itertools import count, islice
+
+from mccurse import tui
+from mccurse.addon import Mod
+
+
+def mods(consumed: list):
+    """Provide endless mods, recording which were consumed."""
+
+    for i in count(1):
+        consumed.append(i)
+        yield Mod(id=i, name='mod {}'.format(i), summary='Summary {}'.format(i))
+
+
+def test_lazy_walker_positions():
+    """Are the positions provided lazily forward and completely backwards?"""
+
+    consumed = []
+    walker = tui.LazyListWalker(islice(mods(consumed), 5))
+
+    forward = walker.positions()
+    assert [next(forward), next(forward)] == [0, 1]
+    assert len(consumed) == 2
+
+    assert list(walker.positions(reverse=True)) == [4, 3, 2, 1, 0]
+    assert list(walker.positions()) == [0, 1, 2, 3, 4]
+
+
+def test_mod_menu_home_end():
+    """Do the Home and End keys move the focus to the first and last mod?"""
+
+    consumed = []
+    menu = tui.ModMenu(islice(mods(consumed), 50))
+    size = (40, 10)
+
+    menu.render(size, focus=True)
+    assert len(consumed) < 50
+
+    assert menu.keypress(size, 'end') is None
+    menu.render(size, focus=True)
+    assert menu.focus_position == 49
+
+    assert menu.keypress(size, 'home') is None
+    menu.render(size, focus=True)
+    assert menu.focus_position == 0
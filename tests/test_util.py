@@ -1,6 +1,8 @@
 """Tests for util submodule."""
 
 
+import bz2
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -9,7 +11,8 @@ import requests
 import xdg
 
 from mccurse import util
-from mccurse.util import yaml
+from mccurse.util import bzip2, yaml
+from mccurse.util.cache import LRUCache
 
 
 def test_expected_resource_name():
@@ -95,6 +98,177 @@ def test_lazydict_exceptions(key, exception):
         x = d[key]  # noqa
 
 
+def test_prefetched_order():
+    """Are the prefetched items provided in order?"""
+
+    INPUT = range(100)
+
+    assert list(util.prefetched(INPUT, maxsize=2)) == list(INPUT)
+
+
+def test_prefetched_exceptions():
+    """Are the producer exceptions re-raised in consumer?"""
+
+    def failing():
+        yield 1
+        raise RuntimeError('Producer failed')
+
+    items = util.prefetched(failing())
+
+    assert next(items) == 1
+    with pytest.raises(RuntimeError):
+        next(items)
+
+
+def test_prefetched_abandoned():
+    """Is the producer stopped when the iteration is abandoned?"""
+
+    produced = []
+
+    def producer():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    items = util.prefetched(producer(), maxsize=2)
+    assert next(items) == 0
+    items.close()
+
+    assert len(produced) < 100
+
+
+def test_file_lock(tmpdir):
+    """Is the lock exclusive?"""
+
+    path = Path(str(tmpdir)) / 'test.lock'
+
+    with util.file_lock(path) as acquired:
+        assert acquired
+        with util.file_lock(path, blocking=False) as again:
+            assert not again
+
+    with util.file_lock(path, blocking=False) as acquired:
+        assert acquired
+
+
+@pytest.fixture(scope='module')
+def multiblock_text() -> bytes:
+    """Text long enough to be compressed to several blocks."""
+
+    return b''.join(b'%d: Lorem ipsum dolor sit amet. ' % i for i in range(30000))
+
+
+def test_bzip2_split_blocks(multiblock_text):
+    """Are the blocks of multiple streams found?"""
+
+    # Level 1 uses 100 kB blocks
+    INPUT = bz2.compress(multiblock_text, 1) + bz2.compress(b'tail', 1)
+    EXPECT = -(-len(multiblock_text) // 100000) + 1
+
+    spans = bzip2.split_blocks(INPUT)
+
+    assert len(spans) >= EXPECT
+    assert spans == sorted(spans)
+    assert spans[0][0] == 32  # Just after the stream header
+
+
+def test_bzip2_decompress(multiblock_text):
+    """Are the blocks decompressed correctly and in order?"""
+
+    INPUT = bz2.compress(multiblock_text, 1) + bz2.compress(b'tail', 1)
+    EXPECT = multiblock_text + b'tail'
+
+    assert b''.join(bzip2.decompress(INPUT, workers=2)) == EXPECT
+
+
+def test_bzip2_decompress_false_split(monkeypatch, multiblock_text):
+    """Are the wrongly split blocks merged back?"""
+
+    INPUT = bz2.compress(multiblock_text, 1)
+
+    spans = bzip2.split_blocks(INPUT)
+    (start, end), middle = spans[1], sum(spans[1]) // 2
+    spans[1:2] = [(start, middle), (middle, end)]
+    monkeypatch.setattr(bzip2, 'split_blocks', lambda data: spans)
+
+    assert b''.join(bzip2.decompress(INPUT, workers=2)) == multiblock_text
+
+
+def test_bzip2_decompress_in_thread(multiblock_text):
+    """Are the blocks decompressed from a thread, as in the pipelined feed?"""
+
+    INPUT = bz2.compress(multiblock_text, 1)
+
+    with ThreadPoolExecutor(max_workers=1) as thread:
+        result = thread.submit(lambda: b''.join(bzip2.decompress(INPUT, workers=2)))
+        assert result.result(timeout=60) == multiblock_text
+
+
+def test_lru_cache_eviction():
+    """Are the least recently used entries evicted and lookups counted?"""
+
+    cache = LRUCache(capacity=2)
+
+    assert cache.get('a', lambda: 1) == 1
+    assert cache.get('b', lambda: 2) == 2
+    assert cache.get('a', lambda: None) == 1  # Refreshes 'a'
+    assert cache.get('c', lambda: 3) == 3  # Evicts 'b'
+
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    def failing():
+        raise RuntimeError('Lookup failed')
+
+    with pytest.raises(RuntimeError):
+        cache.get('d', failing)
+    assert 'd' not in cache
+
+
+def test_lru_cache_store():
+    """Are stored values looked up without counting the stores?"""
+
+    cache = LRUCache(capacity=2)
+
+    assert cache.lookup('a') is None
+    assert cache.lookup('a', []) == []
+    cache.put('a', 1)
+    cache['b'] = 2
+    assert cache.lookup('a') == 1  # Refreshes 'a'
+    cache.put('c', 3)  # Evicts 'b'
+
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_lru_cache_persistence(tmpdir):
+    """Are the entries restored from a file?"""
+
+    path = Path(str(tmpdir)) / 'cache.pickle'
+
+    cache = LRUCache()
+    cache.load(path)  # Missing file is ignored
+    assert not cache.modified
+    cache.get(('key', 1), lambda: [1, 2])
+    assert cache.modified
+    cache.dump(path)
+    assert not cache.modified
+
+    restored = LRUCache(capacity=1)
+    restored.get('newer', lambda: None)
+    restored.load(path)
+
+    assert 'newer' in restored and len(restored) == 1
+
+    restored = LRUCache()
+    restored.load(path)
+    assert restored.get(('key', 1), lambda: None) == [1, 2]
+    assert not restored.modified
+
+    path.write_bytes(b'garbage')
+    LRUCache().load(path)
+
+
 def test_yaml_datetime():
     """Custom datetime serialization works as expected?"""
 